@@ -7,22 +7,22 @@ Usage:
   kick2 parse  <input.preset> [-o output.json] [--summary]
   kick2 generate <input.json> [-o output.preset] [--simple]
   kick2 render <input.json> [-o output.wav] [-r 44100] [-b 24]
-  kick2 roundtrip <input.preset> [-o output_dir]
+  kick2 roundtrip <input.preset> [-o output_dir] [--no-json] [-q | -v]
   kick2 quick <pitch_start> <pitch_end> <length_ms> [-o output.preset]
+  kick2 quick-batch <params.jsonl> [-o output_dir] [-j jobs]
 """
 
+import io
 import sys
 import os
-import json
 import argparse
 
 # Add scripts directory to path
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(SCRIPT_DIR, 'scripts'))
 
-from kick2_parser import parse_preset, print_summary
-from kick2_generator import generate_preset, create_from_simple, prettify_xml
-from kick2_renderer import synthesize_kick, write_wav
+# Generator and renderer (NumPy) are imported inside the commands that use them
+from kick2_parser import parse_preset, print_summary, json_dumps, json_loads
 
 
 def cmd_parse(args):
@@ -31,36 +31,37 @@ def cmd_parse(args):
     if args.summary:
         print_summary(data)
     
-    json_str = json.dumps(data, indent=2)
+    json_bytes = json_dumps(data)
     if args.output:
-        with open(args.output, 'w') as f:
-            f.write(json_str)
+        with open(args.output, 'wb') as f:
+            f.write(json_bytes)
         print(f"Saved JSON: {args.output}")
     elif not args.summary:
-        print(json_str)
+        print(json_bytes.decode('utf-8'))
 
 
 def cmd_generate(args):
     """Generate a .preset from JSON config."""
-    with open(args.input) as f:
-        config = json.load(f)
+    from kick2_generator import generate_preset_fast, create_from_simple
+    
+    with open(args.input, 'rb') as f:
+        config = json_loads(f.read())
     
     if args.simple:
         config = create_from_simple(config)
     
-    root = generate_preset(config)
-    xml_str = prettify_xml(root)
-    
     output = args.output or 'output.preset'
-    with open(output, 'w', encoding='utf-8', newline='\r\n') as f:
-        f.write(xml_str)
+    with open(output, 'wb') as f:
+        f.write(generate_preset_fast(config))
     print(f"Generated: {output}")
 
 
 def cmd_render(args):
     """Render parsed JSON to WAV."""
-    with open(args.input) as f:
-        config = json.load(f)
+    from kick2_renderer import synthesize_kick, write_wav
+    
+    with open(args.input, 'rb') as f:
+        config = json_loads(f.read())
     
     samples = synthesize_kick(config, args.sample_rate)
     
@@ -73,7 +74,9 @@ def cmd_render(args):
 
 def cmd_roundtrip(args):
     """Full roundtrip: parse → render → regenerate."""
-    import os
+    from contextlib import redirect_stdout
+    from kick2_generator import generate_preset_fast
+    from kick2_renderer import synthesize_kick, write_wav
     
     outdir = args.output or '.'
     os.makedirs(outdir, exist_ok=True)
@@ -83,30 +86,56 @@ def cmd_roundtrip(args):
     wav_path = os.path.join(outdir, f'{base}_render.wav')
     preset_path = os.path.join(outdir, f'{base}_regenerated.preset')
     
-    # Parse
-    print(f"1. Parsing: {args.input}")
-    data = parse_preset(args.input)
-    print_summary(data)
-    
-    with open(json_path, 'w') as f:
-        json.dump(data, f, indent=2)
-    print(f"   → {json_path}")
+    # Progress is collected and written to stdout in one go at the end
+    log = io.StringIO()
     
-    # Render
-    print(f"\n2. Rendering to WAV...")
-    samples = synthesize_kick(data, 44100)
-    write_wav(wav_path, samples, 44100, 24)
-    print(f"   → {wav_path}")
+    def say(line=''):
+        if not args.quiet:
+            log.write(line + '\n')
     
-    # Regenerate
-    print(f"\n3. Regenerating preset...")
-    root = generate_preset(data)
-    xml_str = prettify_xml(root)
-    with open(preset_path, 'w', encoding='utf-8', newline='\r\n') as f:
-        f.write(xml_str)
-    print(f"   → {preset_path}")
+    try:
+        # Parse
+        say(f"1. Parsing: {args.input}")
+        data = parse_preset(args.input)
+        if args.verbose and not args.quiet:
+            with redirect_stdout(log):
+                print_summary(data)
+        
+        if not args.no_json:
+            with open(json_path, 'wb') as f:
+                f.write(json_dumps(data))
+            say(f"   → {json_path}")
+        
+        # Render
+        say(f"\n2. Rendering to WAV...")
+        write_wav(wav_path, synthesize_kick(data, 44100), 44100, 24)
+        say(f"   → {wav_path}")
+        
+        # Regenerate
+        say(f"\n3. Regenerating preset...")
+        with open(preset_path, 'wb') as f:
+            f.write(generate_preset_fast(data))
+        say(f"   → {preset_path}")
+        
+        say(f"\nDone! All files in: {outdir}")
+    finally:
+        # Flush what got done even when a stage fails
+        sys.stdout.write(log.getvalue())
+
+
+def quick_kick_outputs(config, jit=False):
+    """
+    Build (preset_bytes, (wav_header, wav_frames)) for a simple config.
+    jit is passed on to synthesize_kick.
+    """
+    from kick2_generator import generate_preset_fast, create_from_simple
+    from kick2_renderer import synthesize_kick, wav_chunks
     
-    print(f"\nDone! All files in: {outdir}")
+    full_config = create_from_simple(config)
+    preset = generate_preset_fast(full_config)
+    # The samples are encoded right away, so the mix can live in the shared buffer
+    preview = wav_chunks(synthesize_kick(full_config, 44100, reuse_buffer=True, jit=jit), 44100, 24)
+    return preset, preview
 
 
 def cmd_quick(args):
@@ -122,24 +151,68 @@ def cmd_quick(args):
         'limiter': True
     }
     
-    full_config = create_from_simple(config)
-    root = generate_preset(full_config)
-    xml_str = prettify_xml(root)
+    from kick2_renderer import write_chunks
+    
+    preset, preview = quick_kick_outputs(config)
     
     output = args.output or 'quick_kick.preset'
-    with open(output, 'w', encoding='utf-8', newline='\r\n') as f:
-        f.write(xml_str)
+    write_chunks(output, [preset])
     print(f"Generated: {output}")
     print(f"  Pitch: {args.pitch_start}Hz → {args.pitch_end}Hz")
     print(f"  Length: {args.length}ms | Shape: {args.shape} | Curve: {args.curve}")
     
-    # Also render a preview
+    # Also write the rendered preview
     wav_path = output.replace('.preset', '_preview.wav')
-    samples = synthesize_kick(full_config, 44100)
-    write_wav(wav_path, samples, 44100, 24)
+    write_chunks(wav_path, preview)
     print(f"  Preview: {wav_path}")
 
 
+def quick_batch_job(config, preset_path, jit=False):
+    """Generate and render one quick-batch kick (runs in a worker process)."""
+    from kick2_renderer import write_chunks
+    
+    preset, preview = quick_kick_outputs(config, jit)
+    wav_path = preset_path.replace('.preset', '_preview.wav')
+    write_chunks(preset_path, [preset])
+    write_chunks(wav_path, preview)
+    return preset_path, wav_path
+
+
+def cmd_quick_batch(args):
+    """Quick-generate one kick per line of a JSONL file of simple configs."""
+    from concurrent.futures import ProcessPoolExecutor
+    from kick2_renderer import batch_jit
+    
+    outdir = args.output or '.'
+    
+    jobs = []
+    first_line = {}  # name -> line it first appeared on
+    with open(args.input, 'rb') as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            config = json_loads(line)
+            name = config.pop('name', f'kick_{len(jobs) + 1:03d}')
+            # Parallel jobs with the same name would race on the same files
+            if name in first_line:
+                sys.exit(f"{args.input}:{line_no}: duplicate kick name '{name}' "
+                         f"(first used on line {first_line[name]})")
+            first_line[name] = line_no
+            jobs.append((config, os.path.join(outdir, f'{name}.preset')))
+    
+    os.makedirs(outdir, exist_ok=True)
+    jit = batch_jit(len(jobs), args.jobs)
+    
+    # Each kick is independent and CPU-bound, so spread them over processes
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [pool.submit(quick_batch_job, *job, jit) for job in jobs]
+        for future in futures:
+            preset_path, wav_path = future.result()
+            print(f"Generated: {preset_path} (+ {os.path.basename(wav_path)})")
+    
+    print(f"\nDone! {len(jobs)} kicks in: {outdir}")
+
+
 def main():
     parser = argparse.ArgumentParser(description='Kick 2 Preset Toolkit')
     sub = parser.add_subparsers(dest='command', help='Available commands')
@@ -167,6 +240,10 @@ def main():
     rt = sub.add_parser('roundtrip', help='Full parse → render → regenerate')
     rt.add_argument('input', help='.preset file')
     rt.add_argument('-o', '--output', help='Output directory')
+    rt.add_argument('--no-json', action='store_true', help='Skip writing the parsed JSON')
+    rt_out = rt.add_mutually_exclusive_group()
+    rt_out.add_argument('-q', '--quiet', action='store_true', help='Print nothing')
+    rt_out.add_argument('-v', '--verbose', action='store_true', help='Also print the preset summary')
     
     # Quick
     q = sub.add_parser('quick', help='Quick-generate from basic params')
@@ -179,6 +256,13 @@ def main():
     q.add_argument('--no-click', action='store_true', help='Disable click layer')
     q.add_argument('--click-decay', type=int, default=50, help='Click decay %%')
     
+    # Quick batch
+    qb = sub.add_parser('quick-batch', help='Quick-generate many kicks from a JSONL file')
+    qb.add_argument('input', help='JSONL file, one simple config per line')
+    qb.add_argument('-o', '--output', help='Output directory')
+    qb.add_argument('-j', '--jobs', type=int, default=os.cpu_count(),
+                    help='Worker processes (default: all cores)')
+    
     args = parser.parse_args()
     
     if not args.command:
@@ -190,7 +274,8 @@ def main():
         'generate': cmd_generate,
         'render': cmd_render,
         'roundtrip': cmd_roundtrip,
-        'quick': cmd_quick
+        'quick': cmd_quick,
+        'quick-batch': cmd_quick_batch
     }
     
     commands[args.command](args)
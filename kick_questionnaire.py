@@ -7,25 +7,24 @@ Usage:
   python3 kick_questionnaire.py                        # Interactive mode
   python3 kick_questionnaire.py --recipe my.recipe.json  # Replay saved answers
   python3 kick_questionnaire.py --list                  # List saved recipes
+  python3 kick_questionnaire.py --pretty                # Indented .preset XML
 """
 
 import json
 import os
 import sys
 import argparse
-from datetime import datetime
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from types import MappingProxyType
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, os.path.join(SCRIPT_DIR, 'scripts'))
 
-from kick2_generator import generate_preset, prettify_xml
-from kick2_renderer import synthesize_kick, write_wav
-
-try:
-    from kick3_generator import load_template, apply_config, write_preset as write_k3
-    HAS_KICK3 = True
-except ImportError:
-    HAS_KICK3 = False
+# Generator/renderer modules (and datetime) are imported where they are
+# used, so the questions (and --list) start without loading NumPy or the
+# XML writers.
 
 
 # ============================================================
@@ -41,8 +40,10 @@ BANNER = r"""
 
 OUT_DIR = os.path.join(SCRIPT_DIR, 'presets', 'generated')
 RECIPE_DIR = os.path.join(SCRIPT_DIR, 'recipes')
+RECIPE_INDEX = '_index.json'  # {recipe filename: listing fields}, inside RECIPE_DIR
 TEMPLATE_PATH = os.path.join(SCRIPT_DIR, 'presets', 'templates', 'LIKE_BRISBANE.preset')
 
+
 # Musical note frequencies (octave 1)
 NOTE_FREQ = {
     'C': 32.70, 'C#': 34.65, 'Db': 34.65,
@@ -53,74 +54,123 @@ NOTE_FREQ = {
     'A': 55.00, 'A#': 58.27, 'Bb': 58.27,
     'B': 61.74,
 }
+_NOTE_KEYS = frozenset(NOTE_FREQ)
 
 # ============================================================
 # VIBE PRESETS — base templates for each character
 # ============================================================
 # Each vibe defines starting parameters that subsequent
-# questions will modify.  Tweak these dicts to reshape the
+# questions will modify.  Tweak these entries to reshape the
 # defaults the questionnaire offers.
 
-VIBES = {
-    1: {
-        "name": "Deep & Hypnotic",
-        "desc": "Low, meditative groove. Smooth sweep, deep body, subtle movement.",
-        "pitch_start_hz": 8000,
-        "pitch_end_hz": 45,
-        "sweep_speed": 0.35,       # 0 = slow, 1 = fast
-        "default_attack": 0.40,
-        "default_body": 0.75,
-        "default_body_shape": "sustained",
-        "length_pct": 0.50,        # fraction of one beat
-        "default_click": 0.30,
-        "default_click_decay": 0.18,
-    },
-    2: {
-        "name": "Groovy & Punchy",
-        "desc": "Tight, rhythmic energy. Snappy attack, controlled body.",
-        "pitch_start_hz": 10000,
-        "pitch_end_hz": 50,
-        "sweep_speed": 0.55,
-        "default_attack": 0.70,
-        "default_body": 0.55,
-        "default_body_shape": "punchy",
-        "length_pct": 0.48,
-        "default_click": 0.60,
-        "default_click_decay": 0.16,
-    },
-    3: {
-        "name": "Melodic & Warm",
-        "desc": "Round, musical quality. Gentle sweep, warm sustain.",
-        "pitch_start_hz": 6000,
-        "pitch_end_hz": 45,
-        "sweep_speed": 0.40,
-        "default_attack": 0.50,
-        "default_body": 0.70,
-        "default_body_shape": "sustained",
-        "length_pct": 0.50,
-        "default_click": 0.40,
-        "default_click_decay": 0.15,
-    },
-    4: {
-        "name": "Driving & Energetic",
-        "desc": "Forward momentum. Fast sweep, punchy body, strong presence.",
-        "pitch_start_hz": 12000,
-        "pitch_end_hz": 55,
-        "sweep_speed": 0.65,
-        "default_attack": 0.80,
-        "default_body": 0.60,
-        "default_body_shape": "deep_drive",
-        "length_pct": 0.46,
-        "default_click": 0.70,
-        "default_click_decay": 0.20,
-    },
-}
+@dataclass(frozen=True)
+class Vibe:
+    """Base parameters for one vibe character (read-only)."""
+    __slots__ = ("name", "desc", "pitch_start_hz", "pitch_end_hz",
+                 "sweep_speed", "default_attack", "default_body",
+                 "default_body_shape", "length_pct", "default_click",
+                 "default_click_decay")
+    name: str
+    desc: str
+    pitch_start_hz: float
+    pitch_end_hz: float
+    sweep_speed: float
+    default_attack: float
+    default_body: float
+    default_body_shape: str
+    length_pct: float
+    default_click: float
+    default_click_decay: float
+
+
+VIBES = MappingProxyType({
+    1: Vibe(
+        name="Deep & Hypnotic",
+        desc="Low, meditative groove. Smooth sweep, deep body, subtle movement.",
+        pitch_start_hz=8000,
+        pitch_end_hz=45,
+        sweep_speed=0.35,       # 0 = slow, 1 = fast
+        default_attack=0.40,
+        default_body=0.75,
+        default_body_shape="sustained",
+        length_pct=0.50,        # fraction of one beat
+        default_click=0.30,
+        default_click_decay=0.18,
+    ),
+    2: Vibe(
+        name="Groovy & Punchy",
+        desc="Tight, rhythmic energy. Snappy attack, controlled body.",
+        pitch_start_hz=10000,
+        pitch_end_hz=50,
+        sweep_speed=0.55,
+        default_attack=0.70,
+        default_body=0.55,
+        default_body_shape="punchy",
+        length_pct=0.48,
+        default_click=0.60,
+        default_click_decay=0.16,
+    ),
+    3: Vibe(
+        name="Melodic & Warm",
+        desc="Round, musical quality. Gentle sweep, warm sustain.",
+        pitch_start_hz=6000,
+        pitch_end_hz=45,
+        sweep_speed=0.40,
+        default_attack=0.50,
+        default_body=0.70,
+        default_body_shape="sustained",
+        length_pct=0.50,
+        default_click=0.40,
+        default_click_decay=0.15,
+    ),
+    4: Vibe(
+        name="Driving & Energetic",
+        desc="Forward momentum. Fast sweep, punchy body, strong presence.",
+        pitch_start_hz=12000,
+        pitch_end_hz=55,
+        sweep_speed=0.65,
+        default_attack=0.80,
+        default_body=0.60,
+        default_body_shape="deep_drive",
+        length_pct=0.46,
+        default_click=0.70,
+        default_click_decay=0.20,
+    ),
+})
+
+# Answer -> value tables for the questionnaire steps
+DEPTH_MUL = {1: 0.80, 2: 1.00, 3: 1.25, 4: 1.50}
+ATTACK_LEVELS = {1: 0.25, 2: 0.55, 3: 0.78, 4: 0.95}
+BODY_CHOICES = {1: (0.78, "sustained"), 2: (0.55, "punchy"),
+                3: (0.65, "deep_drive"), 4: (0.38, "lean")}
+TAIL_LEVELS = {1: 0.15, 2: 0.50, 3: 0.85}
+TEXTURE_MODES = {1: "none", 2: "subtle", 3: "transient", 4: "full"}
+
+# Pitch envelopes are normalised against the renderer's max frequency
+MAX_PITCH_HZ = 20000
+
+# Settled pitch for every (vibe, depth) pair, computed once at import
+PITCH_END_HZ = {(n, dc): round(v.pitch_end_hz * mul)
+                for n, v in VIBES.items() for dc, mul in DEPTH_MUL.items()}
 
 
 # ============================================================
 # INPUT HELPERS
 # ============================================================
 
+# Accepted numeric answers, as int() / float() took them: "5", "-5", "+5",
+# "1_000" / "0.5", "5.", ".5", "1.5e3" (a float answer needs its ".")
+_DIGITS = r'\d(?:_?\d)*'
+_INT_RE = re.compile(rf'[+-]?{_DIGITS}')
+_FLOAT_RE = re.compile(rf'[+-]?(?:{_DIGITS}\.(?:{_DIGITS})?|\.{_DIGITS})(?:[eE][+-]?{_DIGITS})?')
+
+
+def normalize_note(key):
+    """Canonical note spelling (e.g. 'bb' -> 'Bb'), or None if unrecognised."""
+    norm = key.strip().capitalize()
+    return norm if norm in _NOTE_KEYS else None
+
+
 def print_header(text):
     w = 54
     print(f"\n {'─' * w}")
@@ -142,12 +192,10 @@ def ask_choice(question, options, default=None):
         raw = input(prompt).strip()
         if not raw and default is not None:
             return default
-        try:
+        if _INT_RE.fullmatch(raw):
             val = int(raw)
             if val in options:
                 return val
-        except ValueError:
-            pass
         print(f"    Enter a number between {min(options)} and {max(options)}")
 
 
@@ -159,13 +207,16 @@ def ask_number(question, lo, hi, default=None):
         raw = input(prompt).strip()
         if not raw and default is not None:
             return default
-        try:
-            v = float(raw) if '.' in raw else int(raw)
-            if lo <= v <= hi:
-                return v
-            print(f"    Must be between {lo} and {hi}")
-        except ValueError:
+        if _INT_RE.fullmatch(raw):
+            v = int(raw)
+        elif _FLOAT_RE.fullmatch(raw):
+            v = float(raw)
+        else:
             print("    Enter a valid number")
+            continue
+        if lo <= v <= hi:
+            return v
+        print(f"    Must be between {lo} and {hi}")
 
 
 def ask_text(question, default=None):
@@ -179,7 +230,7 @@ def ask_text(question, default=None):
 # ENVELOPE GENERATORS
 # ============================================================
 
-def generate_pitch_envelope(start_hz, end_hz, sweep_speed, max_hz=20000):
+def generate_pitch_envelope(start_hz, end_hz, sweep_speed, max_hz=MAX_PITCH_HZ):
     """
     Create pitch-envelope nodes from musical intent.
 
@@ -292,13 +343,20 @@ def generate_amp_envelope(attack, body_level, tail_speed, body_shape="sustained"
 
 def generate_click_envelope(intensity, decay_pct):
     """Short amplitude envelope for the click/transient layer."""
+    return [{"x": x, "y": y, "c": c}
+            for x, y, c in _click_envelope_points(intensity, decay_pct)]
+
+
+@lru_cache(maxsize=64)
+def _click_envelope_points(intensity, decay_pct):
+    """(x, y, c) points behind generate_click_envelope, cached per shape."""
     peak = 0.5 + intensity * 0.5
-    return [
-        {"x": 0.0,                       "y": round(peak, 3),       "c": 0.0},
-        {"x": round(decay_pct * 0.4, 4), "y": round(peak * 0.5, 3), "c": 0.0},
-        {"x": round(decay_pct, 4),        "y": 0.0,                  "c": 0.0},
-        {"x": 1.0,                        "y": 0.0,                  "c": 0.0},
-    ]
+    return (
+        (0.0,                       round(peak, 3),       0.0),
+        (round(decay_pct * 0.4, 4), round(peak * 0.5, 3), 0.0),
+        (round(decay_pct, 4),       0.0,                  0.0),
+        (1.0,                       0.0,                  0.0),
+    )
 
 
 # ============================================================
@@ -312,7 +370,7 @@ def run_questionnaire():
 
     # ── 1. VIBE ──────────────────────────────────────────────
     print_header("1. VIBE — What's the overall feeling?")
-    opts = {n: (v["name"], v["desc"]) for n, v in VIBES.items()}
+    opts = {n: (v.name, v.desc) for n, v in VIBES.items()}
     answers["vibe"] = ask_choice("Pick the character closest to what you hear:", opts)
     vibe = VIBES[answers["vibe"]]
 
@@ -321,11 +379,11 @@ def run_questionnaire():
     answers["bpm"] = ask_number("BPM of your track?", 120, 200, default=138)
 
     beat_ms = 60000 / answers["bpm"]
-    auto_len = round(beat_ms * vibe["length_pct"])
+    auto_len = round(beat_ms * vibe.length_pct)
 
     # ── 3. LENGTH ────────────────────────────────────────────
     print_header("3. KICK LENGTH")
-    print(f"\n    Auto: {auto_len}ms  ({vibe['length_pct']*100:.0f}% of {beat_ms:.0f}ms beat)")
+    print(f"\n    Auto: {auto_len}ms  ({vibe.length_pct*100:.0f}% of {beat_ms:.0f}ms beat)")
     lc = ask_choice("Use auto length or set custom?", {
         1: (f"Auto ({auto_len}ms)", f"Good default for {answers['bpm']} BPM"),
         2: ("Custom", "Enter your own value"),
@@ -340,10 +398,9 @@ def run_questionnaire():
         3: ("Medium",     "Bass (~55 Hz) — versatile, present"),
         4: ("Bright",     "Upper bass (~65 Hz) — bright, cutting"),
     }, default=2)
-    depth_mul = {1: 0.80, 2: 1.00, 3: 1.25, 4: 1.50}
-    answers["pitch_end_hz"]   = round(vibe["pitch_end_hz"] * depth_mul[dc])
-    answers["pitch_start_hz"] = vibe["pitch_start_hz"]
-    answers["sweep_speed"]    = vibe["sweep_speed"]
+    answers["pitch_end_hz"]   = PITCH_END_HZ[answers["vibe"], dc]
+    answers["pitch_start_hz"] = vibe.pitch_start_hz
+    answers["sweep_speed"]    = vibe.sweep_speed
 
     # ── 5. ATTACK ────────────────────────────────────────────
     print_header("5. ATTACK — How does the kick hit?")
@@ -353,7 +410,7 @@ def run_questionnaire():
         3: ("Sharp snap",      "Cutting, percussive, immediate"),
         4: ("Aggressive slap", "Hard, intense, in-your-face"),
     }, default=2)
-    answers["attack"] = {1: 0.25, 2: 0.55, 3: 0.78, 4: 0.95}[ac]
+    answers["attack"] = ATTACK_LEVELS[ac]
 
     # ── 6. BODY ──────────────────────────────────────────────
     print_header("6. BODY — How does the middle feel?")
@@ -363,9 +420,7 @@ def run_questionnaire():
         3: ("Deep drive",        "Maximum movement — deep dip, high swell"),
         4: ("Lean & open",       "Space for bass — shallow dip-swell"),
     }, default=1)
-    body_tbl = {1: (0.78, "sustained"), 2: (0.55, "punchy"),
-                3: (0.65, "deep_drive"), 4: (0.38, "lean")}
-    answers["body_level"], answers["body_shape"] = body_tbl[bc]
+    answers["body_level"], answers["body_shape"] = BODY_CHOICES[bc]
 
     # ── 7. TAIL ──────────────────────────────────────────────
     print_header("7. TAIL — How does the kick end?")
@@ -374,7 +429,7 @@ def run_questionnaire():
         2: ("Smooth fade", "Natural, balanced decay"),
         3: ("Long ring",  "Extended resonance — fills more space"),
     }, default=2)
-    answers["tail"] = {1: 0.15, 2: 0.50, 3: 0.85}[tc]
+    answers["tail"] = TAIL_LEVELS[tc]
 
     # ── 8. TEXTURE & TRANSIENT LAYERS ─────────────────────────
     print_header("8. TEXTURE & TRANSIENT LAYERS — Sample layers for character?")
@@ -384,7 +439,7 @@ def run_questionnaire():
         3: ("Defined transient", "1 sample at -6 dB for click definition"),
         4: ("Full stack",        "Transient + texture layers combined"),
     }, default=2)
-    answers["texture_mode"] = {1: "none", 2: "subtle", 3: "transient", 4: "full"}[cc]
+    answers["texture_mode"] = TEXTURE_MODES[cc]
 
     # ── 9. TRACK KEY (optional) ──────────────────────────────
     print_header("9. TRACK KEY (optional)")
@@ -393,15 +448,9 @@ def run_questionnaire():
     print("    fine-tune by ear in the plugin.")
     print("    Enter a note (e.g. F, G#, Bb) or press Enter to skip.")
     key = ask_text("Track key?")
-    if key:
-        norm = key.strip().capitalize()
-        if norm in NOTE_FREQ:
-            answers["track_key"] = norm
-        else:
-            print(f"    '{key}' not recognised — skipping")
-            answers["track_key"] = None
-    else:
-        answers["track_key"] = None
+    answers["track_key"] = normalize_note(key) if key else None
+    if key and answers["track_key"] is None:
+        print(f"    '{key}' not recognised — skipping")
 
     return answers
 
@@ -410,6 +459,13 @@ def run_questionnaire():
 # CONFIG BUILDER
 # ============================================================
 
+@lru_cache(maxsize=None)
+def run_timestamp():
+    """The "generated" stamp shared by every config built in this run."""
+    from datetime import datetime
+    return datetime.now().isoformat()
+
+
 def build_config(answers):
     """Turn questionnaire answers into a full preset JSON config."""
     length = answers["length_ms"]
@@ -429,10 +485,10 @@ def build_config(answers):
     config = {
         "meta": {
             "source": "kick_questionnaire",
-            "vibe": VIBES[answers["vibe"]]["name"],
+            "vibe": VIBES[answers["vibe"]].name,
             "bpm": answers["bpm"],
             "track_key": answers.get("track_key"),
-            "generated": datetime.now().isoformat(),
+            "generated": run_timestamp(),
         },
         "master": {
             "length_ms": length,
@@ -460,7 +516,7 @@ def build_config(answers):
                 "muted": False,
                 "active": True,
                 "pitch_envelope": {
-                    "max_freq_hz": 20000,
+                    "max_freq_hz": MAX_PITCH_HZ,
                     "semitone_offset": 0.0,
                     "range_max": 100.0,
                     "nodes": pitch_nodes,
@@ -501,7 +557,7 @@ def build_config(answers):
             "muted": False,
             "active": True,
             "pitch_envelope": {
-                "max_freq_hz": 20000,
+                "max_freq_hz": MAX_PITCH_HZ,
                 "semitone_offset": 0.0,
                 "range_max": 100.0,
                 "nodes": [{"x": 0.0, "y": 1.0, "c": 0.0},
@@ -541,7 +597,7 @@ def build_config(answers):
             "slot_number": i,
             "type": "off", "type_value": 0.0,
             "gain_db": 0.0, "muted": (i == 5), "active": False,
-            "pitch_envelope": {"max_freq_hz": 20000, "nodes": [], "coarse_nodes": []},
+            "pitch_envelope": {"max_freq_hz": MAX_PITCH_HZ, "nodes": [], "coarse_nodes": []},
             "amp_envelope": {"max_length_ms": length, "nodes": [], "coarse_nodes": []},
         })
 
@@ -552,33 +608,66 @@ def build_config(answers):
 # SUMMARY + TWEAK
 # ============================================================
 
-def print_summary(answers, config):
-    """Show a readable summary of the designed kick."""
-    vibe = VIBES[answers["vibe"]]
-    pn = config["slots"][0]["pitch_envelope"]["nodes"]
-    start_hz = round(pn[0]["y"] * 20000)
-    end_hz   = round(pn[-1]["y"] * 20000)
+SHAPE_LABELS = {"sustained": "Sustained & full", "punchy": "Tight & punchy",
+                "deep_drive": "Deep drive", "lean": "Lean & open"}
+TEXTURE_LABELS = {"none": "None", "subtle": "Subtle texture (-12/-23 dB)",
+                  "transient": "Defined transient (-6 dB)",
+                  "full": "Full stack (transient + texture)"}
+
+_SUMMARY_W = 40  # value column width
+SUMMARY_ROW = f" |  {{:<10}}: {{!s:<{_SUMMARY_W}}} |"
+SUMMARY_BORDER = f" +{'─' * (_SUMMARY_W + 16)}+"
+SUMMARY_TITLE = f" |{'KICK SUMMARY':^{_SUMMARY_W + 16}}|"
+
+NEXT_OPTIONS = {
+    1: ("Generate!", "Create preset files with these settings"),
+    2: ("Tweak",     "Adjust individual parameters"),
+    3: ("Start over", "Restart the questionnaire"),
+}
 
-    shape_labels = {"sustained": "Sustained & full", "punchy": "Tight & punchy",
-                     "deep_drive": "Deep drive", "lean": "Lean & open"}
-    body_lbl = shape_labels.get(answers["body_shape"], answers["body_shape"])
+# Tweak menu number -> (answer key, min, max) for the numeric parameters
+TWEAK_MAP = {
+    1: ("pitch_start_hz", 2000, 16000),
+    2: ("pitch_end_hz",   100,  2500),
+    3: ("sweep_speed",    0.0,  1.0),
+    4: ("attack",         0.0,  1.0),
+    5: ("body_level",     0.0,  1.0),
+    7: ("tail",           0.0,  1.0),
+    9: ("length_ms",      80,   500),
+}
+# Keys follow BODY_CHOICES / TEXTURE_MODES numbering
+TWEAK_BODY_OPTIONS = {
+    1: ("sustained", "Thick, present"), 2: ("punchy", "Snappy, controlled"),
+    3: ("deep_drive", "Maximum movement"), 4: ("lean", "Space for bass"),
+}
+TWEAK_TEXTURE_OPTIONS = {
+    1: ("none", "Pure sine only"), 2: ("subtle", "2 texture layers"),
+    3: ("transient", "1 click layer"), 4: ("full", "Transient + texture"),
+}
 
-    texture_labels = {"none": "None", "subtle": "Subtle texture (-12/-23 dB)",
-                      "transient": "Defined transient (-6 dB)",
-                      "full": "Full stack (transient + texture)"}
-    texture_lbl = texture_labels.get(answers.get("texture_mode", "none"), "None")
+def pitch_endpoints(answers):
+    """
+    Start/end pitch in Hz as the built config will store them, from the
+    pitch envelope alone (no full build_config needed).
+    """
+    pn = generate_pitch_envelope(answers["pitch_start_hz"],
+                                 answers["pitch_end_hz"],
+                                 answers["sweep_speed"])
+    return round(pn[0]["y"] * MAX_PITCH_HZ), round(pn[-1]["y"] * MAX_PITCH_HZ)
 
-    W = 40  # value column width
 
-    def row(label, value):
-        return f" |  {label:<10}: {str(value):<{W}} |"
+def print_summary(answers):
+    """Show a readable summary of the designed kick."""
+    vibe = VIBES[answers["vibe"]]
+    start_hz, end_hz = pitch_endpoints(answers)
 
-    border = f" +{'─' * (W + 16)}+"
-    title  = f" |{'KICK SUMMARY':^{W + 16}}|"
+    body_lbl = SHAPE_LABELS.get(answers["body_shape"], answers["body_shape"])
+    texture_lbl = TEXTURE_LABELS.get(answers.get("texture_mode", "none"), "None")
 
+    row = SUMMARY_ROW.format
     lines = [
-        "", border, title, border,
-        row("Vibe",   vibe['name']),
+        "", SUMMARY_BORDER, SUMMARY_TITLE, SUMMARY_BORDER,
+        row("Vibe",   vibe.name),
         row("BPM",    answers['bpm']),
         row("Length", f"{answers['length_ms']} ms"),
         row("Pitch",  f"{start_hz} Hz -> {end_hz} Hz"),
@@ -587,7 +676,7 @@ def print_summary(answers, config):
         row("Tail",   f"{round(answers['tail']*100)}% fade"),
         row("Texture", texture_lbl),
         row("Key",    answers.get('track_key') or 'Not set'),
-        border, "",
+        SUMMARY_BORDER, "",
     ]
     print("\n".join(lines))
 
@@ -595,11 +684,7 @@ def print_summary(answers, config):
 def tweak_loop(answers):
     """Optional loop to adjust individual parameters before generating."""
     while True:
-        ch = ask_choice("What next?", {
-            1: ("Generate!", "Create preset files with these settings"),
-            2: ("Tweak",     "Adjust individual parameters"),
-            3: ("Start over", "Restart the questionnaire"),
-        }, default=1)
+        ch = ask_choice("What next?", NEXT_OPTIONS, default=1)
 
         if ch == 1:
             return answers
@@ -620,64 +705,57 @@ def tweak_loop(answers):
             9: (f"Length        : {answers['length_ms']} ms", ""),
         })
 
-        tweak_map = {
-            1: ("pitch_start_hz", 2000, 16000),
-            2: ("pitch_end_hz",   100,  2500),
-            3: ("sweep_speed",    0.0,  1.0),
-            4: ("attack",         0.0,  1.0),
-            5: ("body_level",     0.0,  1.0),
-            7: ("tail",           0.0,  1.0),
-            9: ("length_ms",      80,   500),
-        }
-
         if tc == 6:
-            sc = ask_choice("Body shape?", {
-                1: ("sustained", "Thick, present"), 2: ("punchy", "Snappy, controlled"),
-                3: ("deep_drive", "Maximum movement"), 4: ("lean", "Space for bass"),
-            })
-            answers["body_shape"] = {1: "sustained", 2: "punchy", 3: "deep_drive", 4: "lean"}[sc]
+            sc = ask_choice("Body shape?", TWEAK_BODY_OPTIONS)
+            answers["body_shape"] = BODY_CHOICES[sc][1]
         elif tc == 8:
-            sc = ask_choice("Texture mode?", {
-                1: ("none", "Pure sine only"), 2: ("subtle", "2 texture layers"),
-                3: ("transient", "1 click layer"), 4: ("full", "Transient + texture"),
-            })
-            answers["texture_mode"] = {1: "none", 2: "subtle", 3: "transient", 4: "full"}[sc]
-        elif tc in tweak_map:
-            key, lo, hi = tweak_map[tc]
+            sc = ask_choice("Texture mode?", TWEAK_TEXTURE_OPTIONS)
+            answers["texture_mode"] = TEXTURE_MODES[sc]
+        elif tc in TWEAK_MAP:
+            key, lo, hi = TWEAK_MAP[tc]
             answers[key] = ask_number(f"New value for {key}?", lo, hi, answers[key])
 
-        # Rebuild and show updated summary
-        config = build_config(answers)
-        print_summary(answers, config)
+        # Show the updated summary; the full config is built once at the end
+        print_summary(answers)
 
 
 # ============================================================
 # OUTPUT
 # ============================================================
 
-def generate_output(config, answers, name):
-    """Generate all output files and return list of (label, path)."""
+def generate_output(config, answers, name, pretty=False):
+    """
+    Generate all output files and return list of (label, path).
+    The Kick 2 preset is written compact unless pretty is set.
+    """
+    from kick2_generator import generate_preset_fast
+    from kick2_renderer import synthesize_kick, write_wav
+    try:
+        from kick3_generator import load_template, apply_config, write_preset as write_k3
+        has_kick3 = True
+    except ImportError:
+        has_kick3 = False
+
     os.makedirs(OUT_DIR, exist_ok=True)
     os.makedirs(RECIPE_DIR, exist_ok=True)
 
     results = []
 
     # JSON config
+    # Serialize in memory and write once; the config is machine-read, so compact
     p = os.path.join(OUT_DIR, f"{name}.json")
     with open(p, 'w') as f:
-        json.dump(config, f, indent=2)
+        f.write(json.dumps(config, separators=(',', ':')))
     results.append(("JSON config", p))
 
     # Kick 2 preset
-    root = generate_preset(config)
-    xml_str = prettify_xml(root)
     p = os.path.join(OUT_DIR, f"{name}.preset")
-    with open(p, 'w', encoding='utf-8', newline='\r\n') as f:
-        f.write(xml_str)
+    with open(p, 'wb') as f:
+        f.write(generate_preset_fast(config, pretty=pretty))
     results.append(("Kick 2 preset", p))
 
     # Kick 3 preset (if template available)
-    if HAS_KICK3 and os.path.exists(TEMPLATE_PATH):
+    if has_kick3 and os.path.exists(TEMPLATE_PATH):
         tree = load_template(TEMPLATE_PATH)
         tree = apply_config(tree, config)
         p = os.path.join(OUT_DIR, f"{name}_k3.preset")
@@ -693,34 +771,75 @@ def generate_output(config, answers, name):
 
     # Save recipe
     p = os.path.join(RECIPE_DIR, f"{name}.recipe.json")
+    from datetime import datetime
     recipe = {**answers, "generated": datetime.now().isoformat()}
     with open(p, 'w') as f:
-        json.dump(recipe, f, indent=2)
+        f.write(json.dumps(recipe, indent=2))
+    index = load_recipe_index()
+    index[os.path.basename(p)] = recipe_listing(recipe, os.stat(p).st_mtime_ns)
+    save_recipe_index(index)
     results.append(("Recipe", p))
 
     return results
 
 
+def recipe_listing(recipe, mtime_ns):
+    """The recipe fields shown by --list, stamped with the file's mtime."""
+    return {"vibe": recipe.get("vibe"), "bpm": recipe.get("bpm", ""),
+            "length_ms": recipe.get("length_ms", ""), "mtime_ns": mtime_ns}
+
+
+def load_recipe_index():
+    """Load the recipe listing index, or {} if it is missing or unreadable."""
+    try:
+        with open(os.path.join(RECIPE_DIR, RECIPE_INDEX)) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index if isinstance(index, dict) else {}
+
+
+def save_recipe_index(index):
+    """Write the recipe listing index (best effort; it is only a cache)."""
+    try:
+        with open(os.path.join(RECIPE_DIR, RECIPE_INDEX), 'w') as f:
+            f.write(json.dumps(index, indent=2, sort_keys=True))
+    except OSError:
+        pass
+
+
 def list_recipes():
     """Print saved recipes."""
     if not os.path.isdir(RECIPE_DIR):
         print("  No recipes yet.")
         return
-    files = sorted(f for f in os.listdir(RECIPE_DIR) if f.endswith('.recipe.json'))
-    if not files:
+    with os.scandir(RECIPE_DIR) as it:
+        entries = sorted((e for e in it if e.name.endswith('.recipe.json')),
+                         key=lambda e: e.name)
+    if not entries:
         print("  No recipes yet.")
         return
+    # Listing fields come from the index; only recipes missing from it, or
+    # changed since they were indexed (hand edits, git checkouts), are opened
+    index = load_recipe_index()
+    missing = False
     print(f"\n  Saved recipes ({RECIPE_DIR}):\n")
-    for f in files:
-        path = os.path.join(RECIPE_DIR, f)
+    for entry in entries:
+        f = entry.name
         try:
-            with open(path) as fh:
-                r = json.load(fh)
-            vibe = VIBES.get(r.get("vibe", 0), {}).get("name", "?")
+            r = index.get(f)
+            mtime_ns = entry.stat().st_mtime_ns
+            if r is None or r.get("mtime_ns") != mtime_ns:
+                with open(entry.path) as fh:
+                    r = index[f] = recipe_listing(json.load(fh), mtime_ns)
+                missing = True
+            vibe = VIBES[r["vibe"]].name if r.get("vibe") in VIBES else "?"
             print(f"    {f:<40} {vibe}, {r.get('bpm','')} BPM, {r.get('length_ms','')}ms")
         except Exception:
             print(f"    {f}")
     print()
+    if missing:
+        save_recipe_index(index)
 
 
 # ============================================================
@@ -736,6 +855,8 @@ def main():
                         help='Output name (no extension)')
     parser.add_argument('--list', '-l', action='store_true',
                         help='List saved recipes')
+    parser.add_argument('--pretty', action='store_true',
+                        help='Indent the Kick 2 .preset XML (for reading/diffing)')
     args = parser.parse_args()
 
     if args.list:
@@ -750,8 +871,7 @@ def main():
     else:
         while True:
             answers = run_questionnaire()
-            config = build_config(answers)
-            print_summary(answers, config)
+            print_summary(answers)
             result = tweak_loop(answers)
             if result is not None:
                 answers = result
@@ -761,20 +881,20 @@ def main():
     # ── build config ─────────────────────────────────────────
     config = build_config(answers)
     if args.recipe:
-        print_summary(answers, config)
+        print_summary(answers)
 
     # ── output name ──────────────────────────────────────────
     if args.output:
         name = args.output
     else:
         vibe = VIBES[answers["vibe"]]
-        slug = vibe["name"].lower().replace(" & ", "_").replace(" ", "_")
+        slug = vibe.name.lower().replace(" & ", "_").replace(" ", "_")
         default_name = f"{slug}_{answers['bpm']}bpm"
         name = ask_text("Output name?", default=default_name) or default_name
 
     # ── generate ─────────────────────────────────────────────
     print("\n  Generating...\n")
-    results = generate_output(config, answers, name)
+    results = generate_output(config, answers, name, pretty=args.pretty)
 
     for label, path in results:
         print(f"    + {label}: {path}")
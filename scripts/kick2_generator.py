@@ -5,14 +5,23 @@ Creates Sonic Academy Kick 2 .preset XML files from structured JSON parameters.
 Can generate from parsed JSON or from simplified parameter definitions.
 """
 
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+try:
+    # lxml builds and serializes the tree in C; the API used here matches ET
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
 import json
+import math
 import sys
 import os
 import argparse
+from functools import lru_cache
 
 
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
 # Default template values for a basic sine kick
 DEFAULTS = {
     'master': {
@@ -70,35 +79,88 @@ def generate_preset(config, plugin_version="1.5.3"):
     params_elem = ET.SubElement(root, 'Params')
     env_elem = ET.SubElement(root, 'EnvelopeData')
     
+    for kind, key, value in preset_items(config):
+        if kind == 'param':
+            add_param(params_elem, key, value)
+        else:
+            write_envelope(env_elem, key, value)
+    
+    return root
+
+
+def generate_preset_fast(config, plugin_version="1.5.3", pretty=True):
+    """
+    Generate a Kick 2 preset straight to bytes, without building a tree.
+    The output is the CRLF-terminated UTF-8 file contents, with the same
+    params and envelopes as generate_preset + write_preset: indented by
+    default, or with pretty=False all on one line after the declaration.
+    tests/test_kick2_generator.py checks the bytes against that tree path.
+    """
+    nl, ind = (b'\r\n', b'  ') if pretty else (b'', b'')
+    param_fmt = ind * 2 + b'<PARAM id="%s" value="%s"/>' + nl
+    node_fmt = ind * 3 + b'<Node x="%s" y="%s" c="%s"/>' + nl
+    env_open = ind * 2 + b'<Envelope id="%s">' + nl
+    env_close = ind * 2 + b'</Envelope>' + nl
+    env_empty = ind * 2 + b'<Envelope id="%s"/>' + nl
+    
+    params = bytearray()
+    envelopes = bytearray()
+    
+    for kind, key, value in preset_items(config):
+        if kind == 'param':
+            params += param_fmt % (key.encode(), _attr(format_param_value(value)))
+        elif value:
+            envelopes += env_open % key.encode()
+            for x, y, c in node_strings(value):
+                envelopes += node_fmt % (x.encode(), y.encode(), c.encode())
+            envelopes += env_close
+        else:
+            envelopes += env_empty % key.encode()
+    
+    return b''.join([
+        XML_DECLARATION.replace('\n', '\r\n').encode(),
+        b'<Kick2PresetFile pluginVersion="%s">' % _attr(plugin_version), nl,
+        ind, b'<Params>', nl, params, ind, b'</Params>', nl,
+        ind, b'<EnvelopeData>', nl, envelopes, ind, b'</EnvelopeData>', nl,
+        b'</Kick2PresetFile>\r\n',
+    ])
+
+
+def preset_items(config):
+    """
+    Yield the preset contents of a config dict in file order, as
+    ('param', id, value) and ('envelope', id, nodes) tuples.
+    """
+    
     # Master settings
     master = {**DEFAULTS['master'], **config.get('master', {})}
-    add_param(params_elem, 'masterLength', master['length_ms'])
-    add_param(params_elem, 'singleLengthMode', 1.0 if master['single_length_mode'] else 0.0)
-    add_param(params_elem, 'outGain', master['output_gain_db'])
-    add_param(params_elem, 'outGainPosition', master['output_gain_position'])
-    add_param(params_elem, 'masterPan', master['pan'])
-    add_param(params_elem, 'tuning', master['tuning_semitones'])
-    add_param(params_elem, 'pitchWheelRange', master['pitch_wheel_range'])
-    add_param(params_elem, 'processingMode', master['processing_mode'])
-    add_param(params_elem, 'gate', master['gate'])
+    yield 'param', 'masterLength', master['length_ms']
+    yield 'param', 'singleLengthMode', 1.0 if master['single_length_mode'] else 0.0
+    yield 'param', 'outGain', master['output_gain_db']
+    yield 'param', 'outGainPosition', master['output_gain_position']
+    yield 'param', 'masterPan', master['pan']
+    yield 'param', 'tuning', master['tuning_semitones']
+    yield 'param', 'pitchWheelRange', master['pitch_wheel_range']
+    yield 'param', 'processingMode', master['processing_mode']
+    yield 'param', 'gate', master['gate']
     
     # Limiter
     limiter = {**DEFAULTS['limiter'], **config.get('limiter', {})}
-    add_param(params_elem, 'Lim_Enable', 1.0 if limiter['enabled'] else 0.0)
-    add_param(params_elem, 'Lim_Threshold', limiter['threshold_db'])
-    add_param(params_elem, 'Lim_Lookahead', limiter['lookahead'])
-    add_param(params_elem, 'Lim_Release', limiter['release'])
+    yield 'param', 'Lim_Enable', 1.0 if limiter['enabled'] else 0.0
+    yield 'param', 'Lim_Threshold', limiter['threshold_db']
+    yield 'param', 'Lim_Lookahead', limiter['lookahead']
+    yield 'param', 'Lim_Release', limiter['release']
     
     # Process slots
-    slots = config.get('slots', [])
+    slots = list(config.get('slots', []))
     
-    # Ensure we have 5 slots (pad with inactive)
+    # Ensure we have 5 slots (pad with inactive), without touching the config
     while len(slots) < 5:
         slots.append({'type': 'off'})
     
     for i, slot_config in enumerate(slots[:5]):
         slot_num = i + 1
-        generate_slot(params_elem, env_elem, slot_num, slot_config, master)
+        yield from generate_slot(slot_num, slot_config, master)
     
     # FX routing
     fx = config.get('fx_routing', {})
@@ -107,37 +169,35 @@ def generate_preset(config, plugin_version="1.5.3"):
         insert_config = fx.get(insert_key, {})
         for osc in range(1, 6):
             routed = insert_config.get(f'osc{osc}', False)
-            add_param(params_elem, f'FXInsert{insert_num}Osc{osc}Routed', 1.0 if routed else 0.0)
+            yield 'param', f'FXInsert{insert_num}Osc{osc}Routed', 1.0 if routed else 0.0
         
         # FX slot types and gains
         for slot_num in [1, 2]:
-            add_param(params_elem, f'FXInsert{insert_num}Slot{slot_num}Type',
-                      insert_config.get(f'slot{slot_num}_type', 0.0))
-            add_param(params_elem, f'FXInsert{insert_num}Slot{slot_num}Gain',
-                      insert_config.get(f'slot{slot_num}_gain', 0.0))
+            yield ('param', f'FXInsert{insert_num}Slot{slot_num}Type',
+                   insert_config.get(f'slot{slot_num}_type', 0.0))
+            yield ('param', f'FXInsert{insert_num}Slot{slot_num}Gain',
+                   insert_config.get(f'slot{slot_num}_gain', 0.0))
     
     # Master FX
     master_fx = fx.get('master_fx', {})
     for slot_num in [1, 2]:
-        add_param(params_elem, f'MstrFXSlot{slot_num}Type',
-                  master_fx.get(f'slot{slot_num}_type', 0.0))
-        add_param(params_elem, f'MstrFXSlot{slot_num}Gain',
-                  master_fx.get(f'slot{slot_num}_gain', 0.0))
-    
-    return root
+        yield ('param', f'MstrFXSlot{slot_num}Type',
+               master_fx.get(f'slot{slot_num}_type', 0.0))
+        yield ('param', f'MstrFXSlot{slot_num}Gain',
+               master_fx.get(f'slot{slot_num}_gain', 0.0))
 
 
-def generate_slot(params_elem, env_elem, slot_num, slot_config, master):
-    """Generate params and envelopes for a single oscillator slot."""
+def generate_slot(slot_num, slot_config, master):
+    """Yield params and envelopes for a single oscillator slot."""
     
     type_map = {'off': 0.0, 'sine': 1.0, 'sample': 2.0}
     slot_type = slot_config.get('type', 'off')
     
-    add_param(params_elem, f'Slot{slot_num}Type', type_map.get(slot_type, 0.0))
-    add_param(params_elem, f'Slot{slot_num}Gain', slot_config.get('gain_db', 0.0))
+    yield 'param', f'Slot{slot_num}Type', type_map.get(slot_type, 0.0)
+    yield 'param', f'Slot{slot_num}Gain', slot_config.get('gain_db', 0.0)
     
     if slot_config.get('muted', False):
-        add_param(params_elem, f'Slot{slot_num}Mute', 1.0)
+        yield 'param', f'Slot{slot_num}Mute', 1.0
     
     # Pitch envelope
     pe = slot_config.get('pitch_envelope', {})
@@ -149,17 +209,17 @@ def generate_slot(params_elem, env_elem, slot_num, slot_config, master):
     if slot_type == 'sine' and not pitch_nodes:
         pitch_nodes = DEFAULT_PITCH_NODES
     
-    add_param(params_elem, f'Slot{slot_num}PitchEnvMax', pitch_max)
-    add_param(params_elem, f'Slot{slot_num}PitchEnvRangeMax', pe.get('range_max', 100.0))
-    add_param(params_elem, f'Slot{slot_num}PitchSemi', pitch_semi)
+    yield 'param', f'Slot{slot_num}PitchEnvMax', pitch_max
+    yield 'param', f'Slot{slot_num}PitchEnvRangeMax', pe.get('range_max', 100.0)
+    yield 'param', f'Slot{slot_num}PitchSemi', pitch_semi
     
     # Write coarse pitch nodes (8 max in params)
-    write_coarse_nodes(params_elem, f'Slot{slot_num}PitchNode', pitch_nodes, 8,
-                       default_y=1.0 if slot_type == 'sample' else 0.09)
+    yield from write_coarse_nodes(f'Slot{slot_num}PitchNode', pitch_nodes, 8,
+                                  default_y=1.0 if slot_type == 'sample' else 0.09)
     
     # Write detailed pitch envelope
     env_slot_idx = slot_num - 1
-    write_envelope(env_elem, f'Slot{env_slot_idx}_PitchEnvelope', pitch_nodes)
+    yield 'envelope', f'Slot{env_slot_idx}_PitchEnvelope', pitch_nodes
     
     # Amp envelope
     ae = slot_config.get('amp_envelope', {})
@@ -176,59 +236,125 @@ def generate_slot(params_elem, env_elem, slot_num, slot_config, master):
             {'x': 1.0, 'y': 0.0, 'c': 0.0}
         ]
     
-    add_param(params_elem, f'Slot{slot_num}AmpEnvMaxLen', amp_max_len)
+    yield 'param', f'Slot{slot_num}AmpEnvMaxLen', amp_max_len
     
     # Write coarse amp nodes
-    write_coarse_nodes(params_elem, f'Slot{slot_num}AmpNode', amp_nodes, 8,
-                       default_y=0.0)
+    yield from write_coarse_nodes(f'Slot{slot_num}AmpNode', amp_nodes, 8,
+                                  default_y=0.0)
     
     # Write detailed amp envelope
-    write_envelope(env_elem, f'Slot{env_slot_idx}_AmpEnvelope', amp_nodes)
+    yield 'envelope', f'Slot{env_slot_idx}_AmpEnvelope', amp_nodes
 
 
-def write_coarse_nodes(params_elem, prefix, nodes, max_nodes, default_y=0.0):
-    """Write coarse envelope nodes to PARAM elements (max 8)."""
-    for i in range(max_nodes):
-        if i < len(nodes):
-            add_param(params_elem, f'{prefix}{i+1}_x', nodes[i]['x'])
-            add_param(params_elem, f'{prefix}{i+1}_y', nodes[i]['y'])
-        else:
-            add_param(params_elem, f'{prefix}{i+1}_x', 1.0)
-            add_param(params_elem, f'{prefix}{i+1}_y', default_y)
+def write_coarse_nodes(prefix, nodes, max_nodes, default_y=0.0):
+    """Yield coarse envelope nodes as PARAM items (max 8)."""
+    for i, node in enumerate(nodes[:max_nodes], 1):
+        yield 'param', f'{prefix}{i}_x', node['x']
+        yield 'param', f'{prefix}{i}_y', node['y']
+    # Unused coarse nodes sit at the end of the envelope
+    for i in range(len(nodes) + 1, max_nodes + 1):
+        yield 'param', f'{prefix}{i}_x', 1.0
+        yield 'param', f'{prefix}{i}_y', default_y
 
 
 def write_envelope(env_elem, env_id, nodes):
     """Write detailed envelope to EnvelopeData section."""
-    envelope = ET.SubElement(env_elem, 'Envelope')
-    envelope.set('id', env_id)
+    envelope = ET.SubElement(env_elem, 'Envelope', {'id': env_id})
     
-    for node in nodes:
-        node_elem = ET.SubElement(envelope, 'Node')
-        node_elem.set('x', f"{node['x']:.16f}" if isinstance(node['x'], float) else str(node['x']))
-        node_elem.set('y', f"{node['y']:.16f}" if isinstance(node['y'], float) else str(node['y']))
-        node_elem.set('c', f"{node.get('c', 0.0):.16f}")
+    # Attributes go in through the constructor rather than one set() each
+    for x, y, c in node_strings(nodes):
+        ET.SubElement(envelope, 'Node', {'x': x, 'y': y, 'c': c})
 
 
 def add_param(params_elem, pid, value):
     """Add a PARAM element."""
-    param = ET.SubElement(params_elem, 'PARAM')
-    param.set('id', pid)
+    ET.SubElement(params_elem, 'PARAM', {'id': pid, 'value': format_param_value(value)})
+
+
+def format_param_value(value):
+    """PARAM value attribute text."""
     if isinstance(value, float):
-        param.set('value', f"{value}")
+        return f"{value}"
+    return str(value)
+
+
+def format_node_value(value):
+    """Envelope node coordinate text (fixed 16 decimals for floats)."""
+    return f"{value:.16f}" if isinstance(value, float) else str(value)
+
+
+def format_node(node):
+    """(x, y, c) attribute strings of an envelope node."""
+    return (format_node_value(node['x']), format_node_value(node['y']),
+            f"{node.get('c', 0.0):.16f}")
+
+
+def node_strings(nodes):
+    """(x, y, c) attribute strings for each node."""
+    return [format_node(n) for n in nodes]
+
+
+def _attr(text):
+    """Escape text for a double-quoted attribute (as ET does) and encode it as UTF-8."""
+    return (text.replace('&', '&amp;').replace('<', '&lt;')
+            .replace('>', '&gt;').replace('"', '&quot;')
+            .replace('\r', '&#13;').replace('\n', '&#10;').replace('\t', '&#09;')
+            .encode('utf-8'))
+
+
+def indent_xml(elem, level=0, space='  '):
+    """Indent an element tree in place (ET.indent fallback for Python < 3.9)."""
+    pad = '\n' + level * space
+    if len(elem):
+        if not elem.text or not elem.text.strip():
+            elem.text = pad + space
+        for child in elem:
+            indent_xml(child, level + 1, space)
+        if not child.tail or not child.tail.strip():
+            child.tail = pad
+    if level and (not elem.tail or not elem.tail.strip()):
+        elem.tail = pad
+
+
+def indent_tree(elem):
+    """Indent an element tree in place with two-space indentation."""
+    if hasattr(ET, 'indent'):
+        ET.indent(elem, space='  ')
     else:
-        param.set('value', str(value))
+        indent_xml(elem)
 
 
 def prettify_xml(elem):
     """Return prettified XML string."""
-    rough = ET.tostring(elem, encoding='unicode', xml_declaration=False)
-    parsed = minidom.parseString(rough)
-    pretty = parsed.toprettyxml(indent='  ', encoding=None)
-    # Remove extra declaration minidom adds
-    lines = pretty.split('\n')
-    if lines[0].startswith('<?xml'):
-        lines[0] = '<?xml version="1.0" encoding="UTF-8"?>'
-    return '\n'.join(lines)
+    if HAS_LXML:
+        return XML_DECLARATION + ET.tostring(elem, encoding='unicode', pretty_print=True)
+    # Indent the tree in place and serialize once (no minidom re-parse)
+    indent_tree(elem)
+    body = ET.tostring(elem, encoding='unicode')
+    return XML_DECLARATION + body + '\n'
+
+
+def write_preset(elem, output_path, pretty=True):
+    """
+    Write a preset tree to disk, indented, as UTF-8 with CRLF line endings.
+    With the stdlib ElementTree the tree is streamed into a buffered file
+    instead of being built up as one string first; lxml pretty-prints the
+    whole document in a single C call. pretty=False skips the indentation
+    and writes the tree compact (Kick 2 does not need it indented).
+    """
+    with open(output_path, 'w', encoding='utf-8', newline='\r\n',
+              buffering=1 << 16) as f:
+        if HAS_LXML:
+            if pretty:
+                f.write(prettify_xml(elem))
+            else:
+                f.write(XML_DECLARATION + ET.tostring(elem, encoding='unicode') + '\n')
+            return
+        if pretty:
+            indent_tree(elem)
+        f.write(XML_DECLARATION)
+        ET.ElementTree(elem).write(f, encoding='unicode')
+        f.write('\n')
 
 
 def create_from_simple(simple_config):
@@ -354,18 +480,27 @@ def create_from_simple(simple_config):
     return config
 
 
-def generate_exp_pitch_nodes(y_start, y_end, num_points=6):
-    """Generate exponential pitch decay nodes."""
-    import math
-    nodes = []
+@lru_cache(maxsize=16)
+def exp_decay_shape(num_points):
+    """
+    (x, exp_t, c) per point of the exponential pitch decay. Only y depends on
+    the start/end pitch, so the curve itself is computed once per size.
+    """
+    shape = []
     for i in range(num_points):
         t = i / (num_points - 1)
         # Exponential decay curve
         exp_t = 1.0 - math.exp(-4.0 * t)
-        y = y_start + (y_end - y_start) * exp_t
         c = -0.1 if i == 1 else (-0.04 if i == num_points - 2 else 0.0)
-        nodes.append({'x': round(t, 4), 'y': round(y, 4), 'c': c})
-    return nodes
+        shape.append((round(t, 4), exp_t, c))
+    return tuple(shape)
+
+
+def generate_exp_pitch_nodes(y_start, y_end, num_points=6):
+    """Generate exponential pitch decay nodes."""
+    span = y_end - y_start
+    return [{'x': x, 'y': round(y_start + span * exp_t, 4), 'c': c}
+            for x, exp_t, c in exp_decay_shape(num_points)]
 
 
 def main():
@@ -382,11 +517,8 @@ def main():
     if args.simple:
         config = create_from_simple(config)
     
-    root = generate_preset(config, args.version)
-    xml_str = prettify_xml(root)
-    
-    with open(args.output, 'w', encoding='utf-8', newline='\r\n') as f:
-        f.write(xml_str)
+    with open(args.output, 'wb') as f:
+        f.write(generate_preset_fast(config, args.version))
     
     print(f"Generated preset: {args.output}")
 
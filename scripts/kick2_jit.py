@@ -0,0 +1,82 @@
+"""
+Fused Numba kernels for kick2_renderer, kept in their own module so that
+only renders which use them pay for importing Numba (see
+kick2_renderer.jit_kernels), and so that cache=True can store them.
+"""
+
+import math
+
+from numba import njit
+
+
+@njit(cache=True, fastmath=True)
+def _envelope_at(xs, ys, cs, left, t):
+    """Envelope value at time t inside segment `left` (interpolate_envelope rules)."""
+    lx = xs[left]
+    segment_len = xs[left + 1] - lx
+    local_t = 0.0
+    if segment_len > 0:
+        local_t = min(max((t - lx) / segment_len, 0.0), 1.0)
+    c = cs[left]
+    if abs(c) > 0.001:
+        if c < 0:
+            local_t = 1.0 - (1.0 - local_t) ** (1.0 + abs(c) * 5)
+        else:
+            local_t = local_t ** (1.0 + abs(c) * 5)
+    return ys[left] + (ys[left + 1] - ys[left]) * local_t
+
+
+@njit(cache=True, fastmath=True)
+def render_sine_voice(pxs, pys, pcs, axs, ays, acs, pitch_max, sample_rate, gain, out):
+    """Pitch env + amp env + phase accumulation + sine, mixed into out in one pass."""
+    n = out.shape[0]
+    denom = max(n - 1, 1)
+    p_left = 0
+    a_left = 0
+    phase = 0.0
+    for i in range(n):
+        t = i / denom
+        # Envelopes are time-ordered, so each segment pointer only moves forward
+        while p_left < pxs.shape[0] - 2 and pxs[p_left + 1] <= t:
+            p_left += 1
+        while a_left < axs.shape[0] - 2 and axs[a_left + 1] <= t:
+            a_left += 1
+        freq = _envelope_at(pxs, pys, pcs, p_left, t) * pitch_max
+        amp = _envelope_at(axs, ays, acs, a_left, t)
+        out[i] += math.sin(2.0 * math.pi * phase) * amp * gain
+        phase += freq / sample_rate
+
+
+@njit(cache=True, fastmath=True)
+def render_noise_voice(raw, alpha, axs, ays, acs, gain, out):
+    """One-pole low-passed noise * amp env, mixed into out in one pass."""
+    n = out.shape[0]
+    denom = max(n - 1, 1)
+    a_left = 0
+    prev = 0.0
+    for i in range(n):
+        t = i / denom
+        while a_left < axs.shape[0] - 2 and axs[a_left + 1] <= t:
+            a_left += 1
+        prev = prev + alpha * (raw[i] - prev)
+        out[i] += prev * _envelope_at(axs, ays, acs, a_left, t) * 0.3 * gain
+
+
+@njit(cache=True, fastmath=True)
+def limiter_kernel(samples, threshold, attack_coeff, release_coeff, knee):
+    """apply_limiter's gain recursion, applied to samples in place."""
+    gain_reduction = 1.0
+    for i in range(samples.shape[0]):
+        level = abs(samples[i])
+        if level > threshold:
+            target_gain = 1.0 / (level / threshold)
+        elif level > threshold - knee:
+            blend = (level - (threshold - knee)) / knee
+            target_gain = 1.0 - blend * (1.0 - threshold / max(level, 0.0001))
+        else:
+            target_gain = 1.0
+        if target_gain < gain_reduction:
+            gain_reduction = attack_coeff * gain_reduction + (1 - attack_coeff) * target_gain
+        else:
+            gain_reduction = release_coeff * gain_reduction + (1 - release_coeff) * target_gain
+        samples[i] *= gain_reduction
@@ -5,91 +5,226 @@ Parses Sonic Academy Kick 2 .preset XML files into structured JSON.
 Extracts oscillator settings, envelopes, FX routing, master settings.
 """
 
-import xml.etree.ElementTree as ET
+try:
+    # libxml2 does the tokenizing in C; the pull-parser API matches ET
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
 import json
+import mmap
 import sys
 import os
 import argparse
 from collections import defaultdict
+from operator import itemgetter
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def json_dumps(obj, pretty=True):
+    """Serialize to UTF-8 JSON bytes, using orjson when available."""
+    if HAS_ORJSON:
+        # NON_STR_KEYS: like json.dumps, accept e.g. the None key of an
+        # <Envelope> without an id (written as "null")
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if pretty else None).encode('utf-8')
+
+
+def json_loads(data):
+    """Deserialize JSON from bytes or str, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Bytes handed to the XML parser per feed() call
+FEED_CHUNK = 1 << 16
+
+# (x, y) of a parsed node dict
+NODE_XY = itemgetter('x', 'y')
+
+# Tag suffixes of the per-slot envelope elements (Slot0_AmpEnvelope, ...)
+ENV_SUFFIXES = ('_AmpEnvelope', '_PitchEnvelope')
+
+# Extra XMLPullParser options: lxml can skip xml:id bookkeeping and the
+# libxml2 size limits that large preset dumps run into
+PARSER_OPTIONS = {'huge_tree': True, 'collect_ids': False} if HAS_LXML else {}
+
+# Root-level sections whose children are handled (and freed) as they stream in
+STREAMED_SECTIONS = frozenset(('Params', 'PARAMS', 'EnvelopeData', 'ENVELOPEDATA', 'DATA'))
 
 
 def parse_preset(filepath):
     """Parse a Kick 2 .preset file and return structured data."""
-    tree = ET.parse(filepath)
-    root = tree.getroot()
+    # Memory-map the file so the parser reads OS pages directly
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return parse_preset_bytes(b'', os.path.basename(filepath))
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return parse_preset_bytes(mm, os.path.basename(filepath))
+
+
+def parse_preset_bytes(data, source_file='<memory>'):
+    """Parse preset XML from a bytes-like object (bytes, mmap, ...)."""
+    return parse_preset_events(preset_events(data), source_file)
+
+
+def preset_events(data):
+    """Stream ('start'|'end', element) events while feeding the XML in chunks."""
+    parser = ET.XMLPullParser(events=('start', 'end'), **PARSER_OPTIONS)
+    for start in range(0, len(data), FEED_CHUNK):
+        parser.feed(data[start:start + FEED_CHUNK])
+        yield from parser.read_events()
+    parser.close()
+    yield from parser.read_events()
+
+
+def envelope_nodes(elem, node_tags):
+    """
+    Read x/y/c node dicts from an envelope element's children. node_tags is
+    (primary, alternate); alternate-case nodes, which presets rarely mix in,
+    are collected in the same walk and appended after the primary ones.
+    """
+    primary, alternate = node_tags
+    nodes = []
+    alternate_nodes = []
+    f = float
+    for node in elem:
+        tag = node.tag
+        if tag == primary:
+            target = nodes
+        elif tag == alternate:
+            target = alternate_nodes
+        else:
+            continue
+        node_get = node.get
+        target.append({
+            'x': f(node_get('x', 0)),
+            'y': f(node_get('y', 0)),
+            'c': f(node_get('c', 0))
+        })
+    if alternate_nodes:
+        nodes.extend(alternate_nodes)
+    return nodes
+
+
+def _to_float(v):
+    """Return a PARAM value as float when it parses as one, else unchanged."""
+    try:
+        return float(v)
+    except (ValueError, TypeError):
+        return v
+
+
+def parse_preset_events(events, source_file):
+    """Build structured data from a stream of parse events in one pass.
+    
+    Only the first Params/PARAMS, EnvelopeData/ENVELOPEDATA and DATA
+    sections below the root are read, as the root.find() lookups used to;
+    every section is cleared once handled so the full tree never has to
+    stay in memory.
+    """
+    root = None
+    depth = 0
+    section = None      # (tag, first_of_its_tag) of the open root child
+    seen = set()
+    section_params = {'Params': ([], []), 'PARAMS': ([], [])}  # tag -> (ids, values)
+    section_envelopes = {}  # section tag -> {'Envelope': [..], 'ENVELOPE': [..]}
+    section_sizes = {}      # section tag -> child count, for the `or` fallback
+    data_envelopes = []     # Kick 3: envelopes inside <DATA>
+    data_attrib = {}
+    root_envelopes = []     # envelopes directly below the root
+    
+    for event, elem in events:
+        if event == 'start':
+            depth += 1
+            if depth == 1:
+                root = elem
+            elif depth == 2:
+                section = (elem.tag, elem.tag not in seen)
+                seen.add(elem.tag)
+            continue
+        
+        depth -= 1
+        if depth == 2:
+            # Entry of a root-level section
+            sec_tag, first = section
+            if sec_tag not in STREAMED_SECTIONS:
+                # Children of other sections (e.g. root-level envelopes) are
+                # read when their parent ends
+                continue
+            tag = elem.tag
+            if not first:
+                pass
+            elif sec_tag in ('Params', 'PARAMS'):
+                if tag == 'PARAM':
+                    ids, values = section_params[sec_tag]
+                    ids.append(elem.get('id'))
+                    values.append(elem.get('value'))
+            elif sec_tag in ('EnvelopeData', 'ENVELOPEDATA'):
+                if tag in ('Envelope', 'ENVELOPE'):
+                    section_envelopes.setdefault(sec_tag, {}).setdefault(tag, []).append(
+                        (elem.get('id'), envelope_nodes(elem, ('Node', 'NODE'))))
+            elif tag.endswith(ENV_SUFFIXES):
+                data_envelopes.append((tag, envelope_nodes(elem, ('node', 'Node'))))
+            elem.clear()
+        elif depth == 1:
+            # A root-level section is complete
+            tag, first = section
+            if first:
+                # Element children only: lxml also keeps comments and PIs
+                section_sizes[tag] = sum(isinstance(c.tag, str) for c in elem)
+                if tag == 'DATA':
+                    data_attrib = dict(elem.attrib)
+            if tag.endswith(ENV_SUFFIXES):
+                root_envelopes.append((tag, envelope_nodes(elem, ('node', 'Node'))))
+            elem.clear()
     
     # Get plugin version - handle both Kick2PresetFile and Kick3 root elements
     root_tag = root.tag
     plugin_version = root.get('pluginVersion', root.get('version', 'unknown'))
     
-    # Parse all PARAM elements - handle both <Params> and <PARAMS>
-    params = {}
-    params_elem = root.find('Params') or root.find('PARAMS')
-    if params_elem is not None:
-        for param in params_elem.findall('PARAM'):
-            pid = param.get('id')
-            val = param.get('value')
-            try:
-                params[pid] = float(val)
-            except (ValueError, TypeError):
-                params[pid] = val
+    # PARAM elements - handle both <Params> and <PARAMS> (an empty <Params>
+    # falls through to <PARAMS>)
+    params_tag = 'Params' if section_sizes.get('Params') else 'PARAMS'
+    ids, values = section_params[params_tag]
+    params = dict(zip(ids, map(_to_float, values)))
     
     # Parse envelope data - try multiple locations
     envelopes = {}
     
     # Method 1: Dedicated EnvelopeData section (Kick 2 format)
-    env_elem = root.find('EnvelopeData') or root.find('ENVELOPEDATA')
-    if env_elem is not None:
-        for envelope in env_elem.findall('Envelope') + env_elem.findall('ENVELOPE'):
-            env_id = envelope.get('id')
-            nodes = []
-            for node in envelope.findall('Node') + envelope.findall('NODE'):
-                nodes.append({
-                    'x': float(node.get('x', 0)),
-                    'y': float(node.get('y', 0)),
-                    'c': float(node.get('c', 0))
-                })
-            envelopes[env_id] = nodes
+    env_tag = 'EnvelopeData' if section_sizes.get('EnvelopeData') else 'ENVELOPEDATA'
+    found = section_envelopes.get(env_tag, {})
+    for env_id, nodes in found.get('Envelope', []) + found.get('ENVELOPE', []):
+        envelopes[env_id] = nodes
     
     # Method 2: Envelopes inside <DATA> element (Kick 3 format)
-    data_elem = root.find('DATA')
-    if data_elem is not None:
-        for child in data_elem:
-            tag = child.tag
-            if '_AmpEnvelope' in tag or '_PitchEnvelope' in tag:
-                nodes = []
-                for node in child.findall('node') + child.findall('Node'):
-                    nodes.append({
-                        'x': float(node.get('x', 0)),
-                        'y': float(node.get('y', 0)),
-                        'c': float(node.get('c', 0))
-                    })
-                envelopes[tag] = nodes
-        
-        # Also extract DATA element attributes (may contain sample paths etc.)
-        for k, v in data_elem.attrib.items():
-            if k not in params:
-                params[f'_data_{k}'] = v
+    for tag, nodes in data_envelopes:
+        envelopes[tag] = nodes
+    
+    # Also extract DATA element attributes (may contain sample paths etc.)
+    for k, v in data_attrib.items():
+        if k not in params:
+            params[f'_data_{k}'] = v
     
     # Method 3: Envelopes as direct children of root (another possible format)
-    for child in root:
-        tag = child.tag
-        if '_AmpEnvelope' in tag or '_PitchEnvelope' in tag:
-            if tag not in envelopes:
-                nodes = []
-                for node in child.findall('node') + child.findall('Node'):
-                    nodes.append({
-                        'x': float(node.get('x', 0)),
-                        'y': float(node.get('y', 0)),
-                        'c': float(node.get('c', 0))
-                    })
-                envelopes[tag] = nodes
+    for tag, nodes in root_envelopes:
+        if tag not in envelopes:
+            envelopes[tag] = nodes
     
     # Build structured output
     result = {
         'meta': {
             'plugin_version': plugin_version,
-            'source_file': os.path.basename(filepath)
+            'source_file': source_file
         },
         'master': extract_master(params),
         'limiter': extract_limiter(params),
@@ -107,21 +242,60 @@ def parse_preset(filepath):
     
     # Add calculated pitch frequencies for sine slots
     for slot in result['slots']:
-        if slot['type'] == 'sine' and slot['pitch_envelope']['nodes']:
-            pitch_max = slot['pitch_envelope']['max_freq_hz']
-            slot['pitch_envelope']['calculated_frequencies'] = [
+        pe = slot['pitch_envelope']
+        if slot['type'] == 'sine' and pe['nodes']:
+            pitch_max = pe['max_freq_hz']
+            max_len = slot['amp_envelope']['max_length_ms']
+            pe['calculated_frequencies'] = [
                 {
-                    'time_normalized': n['x'],
-                    'time_ms': n['x'] * slot['amp_envelope']['max_length_ms'],
-                    'freq_hz': round(n['y'] * pitch_max, 1),
-                    'y_raw': n['y']
+                    'time_normalized': x,
+                    'time_ms': x * max_len,
+                    'freq_hz': round(y * pitch_max, 1),
+                    'y_raw': y
                 }
-                for n in slot['pitch_envelope']['nodes']
+                for x, y in map(NODE_XY, pe['nodes'])
             ]
     
     return result
 
 
+def _slot_keys(i):
+    """PARAM ids for oscillator slot i (1-5); envelope keys are 0-based."""
+    return {
+        'type': f'Slot{i}Type',
+        'mute': f'Slot{i}Mute',
+        'gain': f'Slot{i}Gain',
+        'pitch_nodes': [(f'Slot{i}PitchNode{n}_x', f'Slot{i}PitchNode{n}_y') for n in range(1, 9)],
+        'amp_nodes': [(f'Slot{i}AmpNode{n}_x', f'Slot{i}AmpNode{n}_y') for n in range(1, 9)],
+        'pitch_env': f'Slot{i - 1}_PitchEnvelope',
+        'amp_env': f'Slot{i - 1}_AmpEnvelope',
+        'pitch_max': f'Slot{i}PitchEnvMax',
+        'pitch_semi': f'Slot{i}PitchSemi',
+        'pitch_range_max': f'Slot{i}PitchEnvRangeMax',
+        'amp_max_len': f'Slot{i}AmpEnvMaxLen',
+        'sample_path': f'Slot{i}SamplePath',
+    }
+
+
+# PARAM ids looked up per preset, built once at import
+SLOT_KEYS = {i: _slot_keys(i) for i in range(1, 6)}
+
+FX_ROUTED_KEYS = [
+    (f'osc{osc}', f'FXInsert1Osc{osc}Routed', f'FXInsert2Osc{osc}Routed')
+    for osc in range(1, 6)
+]
+FX_SLOT_KEYS = [
+    (f'insert{insert_num}', f'slot{slot_num}_type', f'slot{slot_num}_gain',
+     f'FXInsert{insert_num}Slot{slot_num}Type', f'FXInsert{insert_num}Slot{slot_num}Gain')
+    for insert_num in [1, 2] for slot_num in [1, 2]
+]
+MASTER_FX_KEYS = [
+    (f'slot{slot_num}_type', f'slot{slot_num}_gain',
+     f'MstrFXSlot{slot_num}Type', f'MstrFXSlot{slot_num}Gain')
+    for slot_num in [1, 2]
+]
+
+
 def extract_master(params):
     """Extract master/global settings."""
     return {
@@ -153,63 +327,56 @@ def extract_fx_routing(params):
         'insert1': {},
         'insert2': {}
     }
-    for osc in range(1, 6):
-        routing['insert1'][f'osc{osc}'] = bool(params.get(f'FXInsert1Osc{osc}Routed', 0))
-        routing['insert2'][f'osc{osc}'] = bool(params.get(f'FXInsert2Osc{osc}Routed', 0))
+    for osc, routed1, routed2 in FX_ROUTED_KEYS:
+        routing['insert1'][osc] = bool(params.get(routed1, 0))
+        routing['insert2'][osc] = bool(params.get(routed2, 0))
     
     # Extract FX slot parameters
-    for insert_num in [1, 2]:
-        for slot_num in [1, 2]:
-            key = f'insert{insert_num}'
-            fx_type = params.get(f'FXInsert{insert_num}Slot{slot_num}Type', 0)
-            fx_gain = params.get(f'FXInsert{insert_num}Slot{slot_num}Gain', 0)
-            routing[key][f'slot{slot_num}_type'] = fx_type
-            routing[key][f'slot{slot_num}_gain'] = fx_gain
+    for key, type_key, gain_key, type_param, gain_param in FX_SLOT_KEYS:
+        routing[key][type_key] = params.get(type_param, 0)
+        routing[key][gain_key] = params.get(gain_param, 0)
     
     # Master FX
     routing['master_fx'] = {}
-    for slot_num in [1, 2]:
-        routing['master_fx'][f'slot{slot_num}_type'] = params.get(f'MstrFXSlot{slot_num}Type', 0)
-        routing['master_fx'][f'slot{slot_num}_gain'] = params.get(f'MstrFXSlot{slot_num}Gain', 0)
+    for type_key, gain_key, type_param, gain_param in MASTER_FX_KEYS:
+        routing['master_fx'][type_key] = params.get(type_param, 0)
+        routing['master_fx'][gain_key] = params.get(gain_param, 0)
     
     return routing
 
 
 def extract_slot(params, envelopes, slot_num, type_map):
     """Extract settings for a single oscillator slot."""
-    slot_type_val = params.get(f'Slot{slot_num}Type', 0)
+    keys = SLOT_KEYS[slot_num]
+    slot_type_val = params.get(keys['type'], 0)
     slot_type = type_map.get(slot_type_val, 'unknown')
     
-    is_muted = bool(params.get(f'Slot{slot_num}Mute', 0))
-    gain = params.get(f'Slot{slot_num}Gain', 0)
+    is_muted = bool(params.get(keys['mute'], 0))
+    gain = params.get(keys['gain'], 0)
     
     # Pitch envelope from PARAM nodes (coarse 8 nodes)
     pitch_coarse = []
-    for n in range(1, 9):
-        x = params.get(f'Slot{slot_num}PitchNode{n}_x', None)
-        y = params.get(f'Slot{slot_num}PitchNode{n}_y', None)
+    for x_key, y_key in keys['pitch_nodes']:
+        x = params.get(x_key, None)
+        y = params.get(y_key, None)
         if x is not None and y is not None:
             pitch_coarse.append({'x': x, 'y': y})
     
     # Amp envelope from PARAM nodes (coarse 8 nodes)
     amp_coarse = []
-    for n in range(1, 9):
-        x = params.get(f'Slot{slot_num}AmpNode{n}_x', None)
-        y = params.get(f'Slot{slot_num}AmpNode{n}_y', None)
+    for x_key, y_key in keys['amp_nodes']:
+        x = params.get(x_key, None)
+        y = params.get(y_key, None)
         if x is not None and y is not None:
             amp_coarse.append({'x': x, 'y': y})
     
     # Detailed envelope from EnvelopeData (slot indices are 0-based there)
-    env_slot_idx = slot_num - 1
-    pitch_env_key = f'Slot{env_slot_idx}_PitchEnvelope'
-    amp_env_key = f'Slot{env_slot_idx}_AmpEnvelope'
-    
-    pitch_nodes = envelopes.get(pitch_env_key, [])
-    amp_nodes = envelopes.get(amp_env_key, [])
+    pitch_nodes = envelopes.get(keys['pitch_env'], [])
+    amp_nodes = envelopes.get(keys['amp_env'], [])
     
-    pitch_env_max = params.get(f'Slot{slot_num}PitchEnvMax', 20000)
-    pitch_semi = params.get(f'Slot{slot_num}PitchSemi', 0)
-    amp_max_len = params.get(f'Slot{slot_num}AmpEnvMaxLen', 300)
+    pitch_env_max = params.get(keys['pitch_max'], 20000)
+    pitch_semi = params.get(keys['pitch_semi'], 0)
+    amp_max_len = params.get(keys['amp_max_len'], 300)
     
     slot = {
         'slot_number': slot_num,
@@ -221,7 +388,7 @@ def extract_slot(params, envelopes, slot_num, type_map):
         'pitch_envelope': {
             'max_freq_hz': pitch_env_max,
             'semitone_offset': pitch_semi,
-            'range_max': params.get(f'Slot{slot_num}PitchEnvRangeMax', 100),
+            'range_max': params.get(keys['pitch_range_max'], 100),
             'coarse_nodes': pitch_coarse,
             'nodes': pitch_nodes  # detailed from EnvelopeData
         },
@@ -235,7 +402,7 @@ def extract_slot(params, envelopes, slot_num, type_map):
     # Add sample info if applicable
     if slot_type == 'sample':
         # Look for sample path params
-        sample_path = params.get(f'Slot{slot_num}SamplePath', '')
+        sample_path = params.get(keys['sample_path'], '')
         slot['sample'] = {
             'path': sample_path
         }
@@ -284,27 +451,61 @@ def print_summary(data):
     print(f"  Insert 2 ← {', '.join(routed2) if routed2 else 'none'}")
 
 
+def parse_to_json(preset_path, json_path, pretty=True):
+    """Parse one preset and save its JSON (a --batch job; runs in a worker process)."""
+    with open(json_path, 'wb') as f:
+        f.write(json_dumps(parse_preset(preset_path), pretty=pretty))
+    return json_path
+
+
+def parse_batch(preset_dir, outdir, pretty=True, jobs=None):
+    """Parse every .preset in preset_dir to <name>.json in outdir, across processes."""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    os.makedirs(outdir, exist_ok=True)
+    names = sorted(e.name for e in os.scandir(preset_dir)
+                   if e.is_file() and e.name.endswith('.preset'))
+    
+    # Each preset is independent and CPU-bound, so spread them over processes
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(parse_to_json, os.path.join(preset_dir, name),
+                               os.path.join(outdir, name[:-len('.preset')] + '.json'), pretty)
+                   for name in names]
+        for future in futures:
+            print(f"Saved to: {future.result()}")
+    return len(names)
+
+
 def main():
     parser = argparse.ArgumentParser(description='Parse Kick 2 preset files')
-    parser.add_argument('input', help='Path to .preset file')
-    parser.add_argument('--output', '-o', help='Output JSON path (default: stdout)')
+    parser.add_argument('input', nargs='?', help='Path to .preset file')
+    parser.add_argument('--output', '-o', help='Output JSON path (default: stdout); output directory with --batch')
     parser.add_argument('--summary', '-s', action='store_true', help='Print human-readable summary')
     parser.add_argument('--pretty', '-p', action='store_true', default=True, help='Pretty-print JSON')
+    parser.add_argument('--batch', metavar='DIR', help='Parse every .preset in DIR (JSON next to them unless -o)')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count(), help='Worker processes for --batch')
     args = parser.parse_args()
     
+    if args.batch:
+        count = parse_batch(args.batch, args.output or args.batch, args.pretty, args.jobs)
+        print(f"\nParsed {count} presets")
+        return
+    if not args.input:
+        parser.error('an input .preset (or --batch DIR) is required')
+    
     data = parse_preset(args.input)
     
     if args.summary:
         print_summary(data)
     
-    json_str = json.dumps(data, indent=2 if args.pretty else None)
+    json_bytes = json_dumps(data, pretty=args.pretty)
     
     if args.output:
-        with open(args.output, 'w') as f:
-            f.write(json_str)
+        with open(args.output, 'wb') as f:
+            f.write(json_bytes)
         print(f"\nSaved to: {args.output}")
     elif not args.summary:
-        print(json_str)
+        print(json_bytes.decode('utf-8'))
 
 
 if __name__ == '__main__':
@@ -3,15 +3,36 @@
 Kick 2 Audio Renderer
 Synthesizes kick drum audio from parsed Kick 2 preset parameters.
 Outputs WAV files using pure Python (no external audio deps required).
+If NumPy is installed, the synthesis loops run vectorised instead, and
+with Numba long renders draw each voice in a single fused compiled loop.
 """
 
 import json
 import math
 import struct
-import wave
 import sys
 import argparse
 import os
+import importlib.util
+from functools import lru_cache
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# Numba is only imported by processes that render enough to earn back its
+# ~0.4 s import and kernel load (see jit_kernels); finding it costs nothing
+HAS_NUMBA = HAS_NUMPY and importlib.util.find_spec('numba') is not None
+
+# Length at which one render through the fused kernels (~0.07 us/sample
+# against NumPy's ~0.5 us) pays for that startup; a 300 ms kick is ~13k
+JIT_MIN_SAMPLES = 1_000_000
+
+# Kicks per worker process at which a batch does (measured break-even for
+# ~200 ms kicks with the limiter on: 130-160 kicks per worker)
+JIT_MIN_BATCH_KICKS = 160
 
 
 def lerp(a, b, t):
@@ -31,18 +52,25 @@ def interpolate_envelope(nodes, num_samples):
     if len(nodes) == 1:
         return [nodes[0]['y']] * num_samples
     
+    # A flat envelope interpolates to its single level whatever the curves
+    y0 = nodes[0]['y']
+    if all(n['y'] == y0 for n in nodes):
+        return [y0] * num_samples
+    
     values = [0.0] * num_samples
     
+    # Leading nodes (excluding the last) with x <= t; t only grows, so this
+    # run only ever lengthens and is advanced instead of rescanned
+    run = 0
+    last = len(nodes) - 1
+    
     for i in range(num_samples):
         t = i / max(num_samples - 1, 1)
         
         # Find surrounding nodes
-        left_idx = 0
-        for j in range(len(nodes) - 1):
-            if nodes[j]['x'] <= t:
-                left_idx = j
-            else:
-                break
+        while run < last and nodes[run]['x'] <= t:
+            run += 1
+        left_idx = max(run - 1, 0)
         
         right_idx = min(left_idx + 1, len(nodes) - 1)
         
@@ -78,45 +106,180 @@ def interpolate_envelope(nodes, num_samples):
     return values
 
 
-def synthesize_kick(config, sample_rate=44100):
+def interpolate_envelope_np(nodes, num_samples):
     """
-    Synthesize kick drum audio from parsed preset config.
-    Returns list of float samples normalized to [-1, 1].
+    NumPy version of interpolate_envelope: same segment lookup and curve
+    tension rules, evaluated one whole segment of samples at a time.
+    Returns an ndarray.
     """
-    # Determine duration
-    master = config.get('master', {})
-    duration_ms = master.get('length_ms', 300)
-    duration_s = duration_ms / 1000.0
-    num_samples = int(duration_s * sample_rate)
+    if not nodes:
+        return np.zeros(num_samples)
     
-    # Mix buffer
-    mix = [0.0] * num_samples
+    if len(nodes) == 1:
+        return np.full(num_samples, float(nodes[0]['y']))
     
-    slots = config.get('slots', [])
+    xs = [float(n['x']) for n in nodes]
+    ys = [float(n['y']) for n in nodes]
+    cs = [float(n.get('c', 0.0)) for n in nodes]
     
-    for slot_idx, slot in enumerate(slots):
+    # A flat envelope interpolates to its single level whatever the curves
+    if ys.count(ys[0]) == len(ys):
+        return np.full(num_samples, ys[0])
+    
+    t = np.arange(num_samples, dtype=np.float64) / max(num_samples - 1, 1)
+    
+    # t is increasing, so each segment (left node = last node, excluding the
+    # final one, with x <= t) covers one contiguous run of samples; segment
+    # j starts at the first sample with t >= x_j
+    starts = [0]
+    if len(nodes) > 2:
+        inner = np.searchsorted(t, xs[1:-1], side='left')
+        starts += np.maximum.accumulate(inner).tolist()
+    ends = starts[1:] + [num_samples]
+    
+    out = np.empty(num_samples)
+    for j, (start, end) in enumerate(zip(starts, ends)):
+        if start >= end:
+            continue
+        segment_len = xs[j + 1] - xs[j]
+        if segment_len > 0:
+            local_t = (t[start:end] - xs[j]) / segment_len
+            np.clip(local_t, 0.0, 1.0, out=local_t)
+        else:
+            # Zero-length segments hold the left value
+            local_t = np.zeros(end - start)
+        
+        # Apply curve tension
+        c = cs[j]
+        if abs(c) > 0.001:
+            power = 1.0 + abs(c) * 5
+            if c < 0:
+                local_t = 1.0 - (1.0 - local_t) ** power
+            else:
+                local_t = local_t ** power
+        
+        out[start:end] = ys[j] + (ys[j + 1] - ys[j]) * local_t
+    
+    return out
+
+
+def envelope_arrays(nodes):
+    """
+    Envelope nodes as (xs, ys, cs) float64 arrays with at least two nodes,
+    padding empty/single-node envelopes so they evaluate to a constant.
+    """
+    if not nodes:
+        nodes = [{'x': 0.0, 'y': 0.0}, {'x': 1.0, 'y': 0.0}]
+    elif len(nodes) == 1:
+        nodes = [{'x': 0.0, 'y': nodes[0]['y']}, {'x': 1.0, 'y': nodes[0]['y']}]
+    xs = np.array([n['x'] for n in nodes], dtype=np.float64)
+    ys = np.array([n['y'] for n in nodes], dtype=np.float64)
+    cs = np.array([n.get('c', 0.0) for n in nodes], dtype=np.float64)
+    return xs, ys, cs
+
+
+@lru_cache(maxsize=None)
+def jit_kernels():
+    """
+    Import the fused kernels from kick2_jit (compiled, or loaded from
+    Numba's cache, on first use). Returns (render_sine_voice,
+    render_noise_voice, limiter_kernel), or None when Numba cannot be
+    imported.
+    """
+    try:
+        import kick2_jit
+    except ImportError:
+        return None
+    return kick2_jit.render_sine_voice, kick2_jit.render_noise_voice, kick2_jit.limiter_kernel
+
+
+def use_jit(num_samples, jit=False):
+    """
+    Whether a render of num_samples should go through the Numba kernels:
+    long renders, or any render when jit is set (see batch_jit).
+    """
+    return HAS_NUMBA and (jit or num_samples >= JIT_MIN_SAMPLES) and jit_kernels() is not None
+
+
+def batch_jit(num_kicks, jobs=None):
+    """Whether num_kicks spread over `jobs` worker processes should render with Numba."""
+    return HAS_NUMBA and num_kicks >= JIT_MIN_BATCH_KICKS * (jobs or os.cpu_count() or 1)
+
+
+def render_voices_jit(voices, num_samples, sample_rate, mix):
+    """Render (slot, gain_linear) voices into the zeroed mix with the fused Numba kernels."""
+    render_sine_voice, render_noise_voice, _ = jit_kernels()
+    for slot, gain_linear in voices:
+        ae = slot.get('amp_envelope', {})
+        amp = envelope_arrays(ae.get('nodes', []))
+        if slot.get('type') == 'sine':
+            pe = slot.get('pitch_envelope', {})
+            pitch = envelope_arrays(pe.get('nodes', []))
+            render_sine_voice(*pitch, *amp, float(pe.get('max_freq_hz', 20000)),
+                              float(sample_rate), float(gain_linear), mix)
+        else:
+            render_noise_voice(noise_array(num_samples), lowpass_alpha(sample_rate),
+                               *amp, float(gain_linear), mix)
+
+
+def _active_slots(config):
+    """Yield (slot, gain_linear) for every slot that should be rendered."""
+    for slot in config.get('slots', []):
         if not slot.get('active', False) and slot.get('type', 'off') == 'off':
             continue
         if slot.get('muted', False):
             continue
         
         slot_type = slot.get('type', 'off')
-        if slot_type == 'off':
+        if slot_type not in ('sine', 'sample'):
+            continue
+        
+        # A silent amp envelope contributes nothing, so skip the whole voice
+        amp_nodes = slot.get('amp_envelope', {}).get('nodes', [])
+        if all(n['y'] == 0 for n in amp_nodes):
             continue
         
         gain_db = slot.get('gain_db', 0.0)
         gain_linear = 10 ** (gain_db / 20.0) if gain_db != 0 else 1.0
-        
+        yield slot, gain_linear
+
+
+def synthesize_kick(config, sample_rate=44100, reuse_buffer=False, jit=False):
+    """
+    Synthesize kick drum audio from parsed preset config.
+    Returns float samples normalized to [-1, 1]: a float64 ndarray when
+    NumPy is installed, otherwise a list.
+    
+    With reuse_buffer (NumPy only) the kick is rendered into a scratch
+    array shared by every reuse_buffer render of the same length, so the
+    result is only valid until the next one; use it when the samples are
+    consumed straight away, e.g. encoded to WAV in a batch loop.
+    
+    jit renders through the Numba kernels (when installed) whatever the
+    length; batches set it when they render enough kicks per process.
+    """
+    # Determine duration
+    master = config.get('master', {})
+    duration_ms = master.get('length_ms', 300)
+    duration_s = duration_ms / 1000.0
+    num_samples = int(duration_s * sample_rate)
+    
+    if HAS_NUMPY:
+        out = mix_buffer(num_samples) if reuse_buffer else None
+        return synthesize_kick_np(config, num_samples, sample_rate, out, jit)
+    
+    # Mix buffer
+    mix = [0.0] * num_samples
+    
+    for slot, gain_linear in _active_slots(config):
+        slot_type = slot.get('type', 'off')
         if slot_type == 'sine':
             audio = synthesize_sine_slot(slot, num_samples, sample_rate)
-        elif slot_type == 'sample':
-            audio = synthesize_noise_slot(slot, num_samples, sample_rate)
         else:
-            continue
+            audio = synthesize_noise_slot(slot, num_samples, sample_rate)
         
         # Apply gain and mix
-        for i in range(num_samples):
-            mix[i] += audio[i] * gain_linear
+        mix = [m + a * gain_linear for m, a in zip(mix, audio)]
     
     # Apply limiter if enabled
     limiter = config.get('limiter', {})
@@ -133,6 +296,138 @@ def synthesize_kick(config, sample_rate=44100):
     return mix
 
 
+def synthesize_kick_np(config, num_samples, sample_rate, out=None, jit=False):
+    """
+    Vectorised synthesize_kick. When use_jit agrees (with Numba) each voice
+    is rendered straight into the mix by a fused kernel; otherwise each
+    active slot is rendered as an array, scaled by its gain and added into
+    the mix in place. The mix is rendered into `out` (a float64 array of
+    num_samples) when given.
+    """
+    voices = list(_active_slots(config))
+    compiled = use_jit(num_samples, jit)
+    
+    if out is None:
+        mix = np.zeros(num_samples)
+    else:
+        mix = out
+        mix.fill(0.0)
+    
+    if compiled:
+        render_voices_jit(voices, num_samples, sample_rate, mix)
+    else:
+        for slot, gain_linear in voices:
+            if slot.get('type') == 'sine':
+                audio = synthesize_sine_slot_np(slot, num_samples, sample_rate)
+            else:
+                audio = synthesize_noise_slot_np(slot, num_samples, sample_rate)
+            # Each voice array is freshly built, so scale it in place and add
+            audio *= gain_linear
+            mix += audio
+    
+    # Apply limiter if enabled (stateful, so it stays a sample loop; compiled
+    # with Numba for long renders)
+    limiter = config.get('limiter', {})
+    if limiter.get('enabled', False):
+        threshold_db = limiter.get('threshold_db', 0.0)
+        threshold = 10 ** (threshold_db / 20.0) if threshold_db < 0 else 1.0
+        if compiled:
+            _, _, limiter_kernel = jit_kernels()
+            limiter_kernel(mix, threshold, *limiter_coeffs(sample_rate), LIMITER_KNEE)
+        else:
+            mix[:] = apply_limiter(mix.tolist(), threshold, sample_rate)
+    
+    # Normalize in place; the array goes straight to encode_pcm, no list copy
+    peak = np.abs(mix).max() if num_samples else 1.0
+    if peak > 0:
+        mix /= peak
+        mix *= 0.89
+    
+    return mix
+
+
+@lru_cache(maxsize=4)
+def mix_buffer(num_samples):
+    """Scratch mix array for reuse_buffer renders, one per kick length."""
+    return np.empty(num_samples)
+
+
+def synthesize_sine_slot_np(slot, num_samples, sample_rate):
+    """Vectorised synthesize_sine_slot: phase is a running sum of freq/sr."""
+    pe = slot.get('pitch_envelope', {})
+    ae = slot.get('amp_envelope', {})
+    
+    pitch_max = pe.get('max_freq_hz', 20000)
+    pitch_env = interpolate_envelope_np(pe.get('nodes', []), num_samples)
+    amp_env = interpolate_envelope_np(ae.get('nodes', []), num_samples)
+    
+    # Phase at sample i is the sum of increments (freq / sr) of samples 0..i-1
+    increments = pitch_env[:-1]
+    increments *= pitch_max
+    increments /= sample_rate
+    phase = np.zeros(num_samples)
+    np.cumsum(increments, out=phase[1:])
+    
+    # sin(2*pi*phase) * amp, computed in place in the phase buffer
+    phase *= 2.0 * np.pi
+    np.sin(phase, out=phase)
+    phase *= amp_env
+    return phase
+
+
+def synthesize_noise_slot_np(slot, num_samples, sample_rate):
+    """Vectorised synthesize_noise_slot over the cached filtered noise."""
+    amp_env = interpolate_envelope_np(slot.get('amp_envelope', {}).get('nodes', []),
+                                      num_samples)
+    return lowpassed_noise(num_samples, sample_rate) * amp_env * 0.3
+
+
+@lru_cache(maxsize=8)
+def noise_array(num_samples):
+    """
+    noise_source as a read-only array; the seed is fixed so it is cached.
+    All the Mersenne Twister words are drawn in one getrandbits() call and
+    turned into floats with Random.random()'s own 53-bit formula, so the
+    values match noise_source exactly.
+    """
+    import random
+    rng = random.Random(42)
+    if num_samples:
+        # random() consumes two 32-bit words per float, low word first
+        bits = rng.getrandbits(64 * num_samples).to_bytes(8 * num_samples, 'little')
+        words = np.frombuffer(bits, dtype='<u4')
+        hi = (words[0::2] >> 5).astype(np.float64)
+        lo = (words[1::2] >> 6).astype(np.float64)
+        raw = (hi * 67108864.0 + lo) * (1.0 / 9007199254740992.0)
+        # uniform(-1, 1) is a + (b - a) * random()
+        raw *= 2.0
+        raw += -1.0
+    else:
+        raw = np.zeros(0)
+    raw.setflags(write=False)
+    return raw
+
+
+@lru_cache(maxsize=8)
+def lowpassed_noise(num_samples, sample_rate):
+    """
+    noise_source through the one-pole low-pass, as a read-only array. It only
+    depends on the length and rate, so every noise slot of a kick shares it.
+    """
+    raw = noise_array(num_samples).tolist()
+    alpha = lowpass_alpha(sample_rate)
+    
+    filtered = [0.0] * num_samples
+    prev = 0.0
+    for i in range(num_samples):
+        prev = prev + alpha * (raw[i] - prev)
+        filtered[i] = prev
+    
+    out = np.array(filtered)
+    out.setflags(write=False)
+    return out
+
+
 def synthesize_sine_slot(slot, num_samples, sample_rate):
     """Synthesize sine wave with pitch and amplitude envelopes."""
     pe = slot.get('pitch_envelope', {})
@@ -149,13 +444,17 @@ def synthesize_sine_slot(slot, num_samples, sample_rate):
     # Convert pitch envelope to frequency
     freqs = [y * pitch_max for y in pitch_env]
     
-    # Synthesize sine with phase accumulation
-    audio = [0.0] * num_samples
+    # Synthesize sine with phase accumulation (libm's sin, locally bound,
+    # beats a lookup table under the interpreter)
+    audio = []
+    append = audio.append
+    sin = math.sin
+    two_pi = 2.0 * math.pi
     phase = 0.0
     
-    for i in range(num_samples):
-        audio[i] = math.sin(2.0 * math.pi * phase) * amp_env[i]
-        phase += freqs[i] / sample_rate
+    for amp, freq in zip(amp_env, freqs):
+        append(sin(two_pi * phase) * amp)
+        phase += freq / sample_rate
         # Keep phase bounded to avoid precision loss
         if phase > 1000.0:
             phase -= 1000.0
@@ -163,6 +462,20 @@ def synthesize_sine_slot(slot, num_samples, sample_rate):
     return audio
 
 
+def noise_source(num_samples):
+    """Deterministic white noise in [-1, 1] for sample/texture layers."""
+    import random
+    rng = random.Random(42)
+    return [rng.uniform(-1, 1) for _ in range(num_samples)]
+
+
+def lowpass_alpha(sample_rate, cutoff=4000.0):
+    """Smoothing coefficient of a one-pole low-pass at `cutoff` Hz."""
+    rc = 1.0 / (2.0 * math.pi * cutoff)
+    dt = 1.0 / sample_rate
+    return dt / (rc + dt)
+
+
 def synthesize_noise_slot(slot, num_samples, sample_rate):
     """
     Synthesize filtered noise for texture/click layers.
@@ -173,17 +486,11 @@ def synthesize_noise_slot(slot, num_samples, sample_rate):
 
     amp_env = interpolate_envelope(amp_nodes, num_samples)
 
-    import random
-    rng = random.Random(42)
-
     # Generate raw noise then low-pass filter for smooth texture
-    raw = [rng.uniform(-1, 1) for _ in range(num_samples)]
+    raw = noise_source(num_samples)
 
     # Simple one-pole low-pass at ~4kHz for warmth
-    cutoff = 4000.0
-    rc = 1.0 / (2.0 * math.pi * cutoff)
-    dt = 1.0 / sample_rate
-    alpha = dt / (rc + dt)
+    alpha = lowpass_alpha(sample_rate)
 
     audio = [0.0] * num_samples
     prev = 0.0
@@ -194,13 +501,20 @@ def synthesize_noise_slot(slot, num_samples, sample_rate):
     return audio
 
 
+LIMITER_KNEE = 0.1  # soft knee width in linear
+
+
+def limiter_coeffs(sample_rate):
+    """Gain smoothing coefficients: ~1ms attack, ~10ms release."""
+    return (math.exp(-1.0 / (0.001 * sample_rate)),
+            math.exp(-1.0 / (0.010 * sample_rate)))
+
+
 def apply_limiter(samples, threshold, sample_rate):
     """Soft-knee limiter with lookahead smoothing."""
     output = list(samples)
-    knee = 0.1  # soft knee width in linear
-    # Smoothing: ~1ms attack, ~10ms release
-    attack_coeff = math.exp(-1.0 / (0.001 * sample_rate))
-    release_coeff = math.exp(-1.0 / (0.010 * sample_rate))
+    knee = LIMITER_KNEE
+    attack_coeff, release_coeff = limiter_coeffs(sample_rate)
     gain_reduction = 1.0
 
     for i in range(len(output)):
@@ -226,49 +540,136 @@ def apply_limiter(samples, threshold, sample_rate):
     return output
 
 
-def write_wav(filepath, samples, sample_rate=44100, bit_depth=24):
-    """Write samples to WAV file."""
-    num_samples = len(samples)
+# Mono PCM RIFF/WAVE header: RIFF chunk, 16-byte fmt chunk, data chunk header
+WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+PCM_MAX = {16: 32767, 24: 8388607, 32: 2147483647}
+
+
+def wav_header(data_len, sample_rate, sampwidth):
+    """Pack the 44-byte header for a mono PCM WAV with data_len bytes of frames."""
+    return WAV_HEADER.pack(b'RIFF', 36 + data_len, b'WAVE',
+                           b'fmt ', 16, 1, 1, sample_rate,
+                           sample_rate * sampwidth, sampwidth, sampwidth * 8,
+                           b'data', data_len)
+
+
+def encode_pcm(samples, bit_depth):
+    """Convert float samples in [-1, 1] to little-endian PCM frame bytes."""
+    if bit_depth not in PCM_MAX:
+        raise ValueError(f"Unsupported bit depth: {bit_depth}")
+    max_val = PCM_MAX[bit_depth]
+    
+    if HAS_NUMPY:
+        scaled = np.clip(np.asarray(samples, dtype=np.float64), -1.0, 1.0)
+        scaled *= max_val  # clip returned a fresh array, scale it in place
+        ints = scaled.astype('<i4')  # truncates toward zero, like int()
+        if bit_depth == 16:
+            return ints.astype('<i2').tobytes()
+        if bit_depth == 24:
+            # Keep the low 3 bytes of each little-endian int32
+            return ints.view(np.uint8).reshape(-1, 4)[:, :3].tobytes()
+        return ints.tobytes()
     
+    vals = [int(max(min(s, 1.0), -1.0) * max_val) for s in samples]
     if bit_depth == 16:
-        max_val = 32767
-        fmt = '<h'
-        sampwidth = 2
-    elif bit_depth == 24:
-        max_val = 8388607
-        sampwidth = 3
-    elif bit_depth == 32:
-        max_val = 2147483647
-        fmt = '<i'
-        sampwidth = 4
-    else:
-        raise ValueError(f"Unsupported bit depth: {bit_depth}")
+        return struct.pack(f'<{len(vals)}h', *vals)
+    frames = bytearray(struct.pack(f'<{len(vals)}i', *vals))
+    if bit_depth == 24:
+        # Drop the high byte of each int32, leaving 3-byte little-endian frames
+        del frames[3::4]
+    return bytes(frames)
+
+
+def wav_bytes(samples, sample_rate=44100, bit_depth=24):
+    """Return a complete mono PCM WAV file (header + frames) as bytes."""
+    return b''.join(wav_chunks(samples, sample_rate, bit_depth))
+
+
+def wav_chunks(samples, sample_rate=44100, bit_depth=24):
+    """Return a mono PCM WAV file as (header, frames) byte strings."""
+    frames = encode_pcm(samples, bit_depth)
+    return wav_header(len(frames), sample_rate, bit_depth // 8), frames
+
+
+def write_chunks(filepath, chunks):
+    """
+    Write byte strings to a file back to back. Where os.writev exists the
+    chunks go out in one gathered write, without joining them first.
+    """
+    if not hasattr(os, 'writev'):
+        with open(filepath, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        return
     
-    with wave.open(filepath, 'w') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(sampwidth)
-        wf.setframerate(sample_rate)
-        
-        frames = bytearray()
-        for s in samples:
-            val = int(max(min(s, 1.0), -1.0) * max_val)
-            if bit_depth == 24:
-                # Pack as 3 bytes (little-endian)
-                frames.extend(struct.pack('<i', val)[:3])
-            else:
-                frames.extend(struct.pack(fmt, val))
-        
-        wf.writeframes(bytes(frames))
+    fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        written = os.writev(fd, chunks)
+        if written < sum(map(len, chunks)):
+            # Short write: finish the remainder with plain writes
+            rest = memoryview(b''.join(chunks))[written:]
+            while rest:
+                rest = rest[os.write(fd, rest):]
+    finally:
+        os.close(fd)
+
+
+def write_wav(filepath, samples, sample_rate=44100, bit_depth=24):
+    """Write samples to a mono PCM WAV file."""
+    write_chunks(filepath, wav_chunks(samples, sample_rate, bit_depth))
+
+
+def render_to_wav(config_path, wav_path, sample_rate=44100, bit_depth=24, jit=False):
+    """Render one JSON config to a WAV (a --batch job; runs in a worker process)."""
+    with open(config_path) as f:
+        config = json.load(f)
+    # The samples are written straight away, so the shared mix buffer is safe
+    write_wav(wav_path, synthesize_kick(config, sample_rate, reuse_buffer=True, jit=jit),
+              sample_rate, bit_depth)
+    return wav_path
+
+
+def render_batch(config_dir, outdir, sample_rate=44100, bit_depth=24, jobs=None):
+    """Render every .json config in config_dir to <name>.wav in outdir, across processes."""
+    from concurrent.futures import ProcessPoolExecutor
+    
+    os.makedirs(outdir, exist_ok=True)
+    names = sorted(e.name for e in os.scandir(config_dir)
+                   if e.is_file() and e.name.endswith('.json'))
+    jit = batch_jit(len(names), jobs)
+    
+    # Each kick is independent and CPU-bound, so spread them over processes
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(render_to_wav, os.path.join(config_dir, name),
+                               os.path.join(outdir, name[:-len('.json')] + '.wav'),
+                               sample_rate, bit_depth, jit)
+                   for name in names]
+        for future in futures:
+            print(f"  Saved: {future.result()}")
+    return len(names)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Render Kick 2 preset to WAV audio')
-    parser.add_argument('input', help='Parsed preset JSON file')
-    parser.add_argument('--output', '-o', default='kick_render.wav', help='Output WAV path')
+    parser.add_argument('input', nargs='?', help='Parsed preset JSON file')
+    parser.add_argument('--output', '-o', help='Output WAV path (default: kick_render.wav); output directory with --batch')
     parser.add_argument('--sample-rate', '-r', type=int, default=44100, help='Sample rate')
     parser.add_argument('--bit-depth', '-b', type=int, default=24, choices=[16, 24, 32], help='Bit depth')
+    parser.add_argument('--batch', metavar='DIR', help='Render every .json config in DIR (WAVs next to them unless -o)')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count(), help='Worker processes for --batch')
     args = parser.parse_args()
     
+    if args.batch:
+        print(f"Rendering kicks in: {args.batch}")
+        count = render_batch(args.batch, args.output or args.batch,
+                             args.sample_rate, args.bit_depth, args.jobs)
+        print(f"Rendered {count} kicks")
+        return
+    if not args.input:
+        parser.error('an input JSON config (or --batch DIR) is required')
+    args.output = args.output or 'kick_render.wav'
+    
     with open(args.input) as f:
         config = json.load(f)
     
@@ -279,7 +680,8 @@ def main():
     samples = synthesize_kick(config, args.sample_rate)
     
     duration_ms = len(samples) / args.sample_rate * 1000
-    peak_db = 20 * math.log10(max(abs(s) for s in samples) + 1e-10)
+    peak = np.abs(samples).max() if HAS_NUMPY else max(abs(s) for s in samples)
+    peak_db = 20 * math.log10(peak + 1e-10)
     
     print(f"  Duration: {duration_ms:.1f} ms ({len(samples)} samples)")
     print(f"  Peak: {peak_db:.1f} dB")
@@ -6,31 +6,87 @@ pitch/amp envelopes and key parameters to create a new preset.
 This ensures all 1006 params, FX defaults, DATA structure etc. are valid.
 """
 
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+try:
+    # lxml parses the 1006-PARAM template and serializes it in C; the API
+    # used here matches ET
+    from lxml import etree as ET
+    HAS_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    HAS_LXML = False
 import json
+import re
 import sys
 import os
 import copy
 import argparse
+from functools import lru_cache
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+def json_loads(data):
+    """Deserialize JSON from bytes or str, using orjson when available."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@lru_cache(maxsize=4)
+def _parsed_template(path, mtime_ns):
+    """Parsed template, cached by absolute path and modification time."""
+    return ET.parse(path)
 
 
 def load_template(template_path):
-    """Load and parse a Kick 3 preset template."""
-    tree = ET.parse(template_path)
-    return tree
+    """
+    Load and parse a Kick 3 preset template. Each template file is parsed
+    once (until it changes on disk); every call returns a deep copy of the
+    cached tree, which is about twice as cheap as re-parsing the ~1006
+    PARAMs, for apply_config to modify.
+    """
+    path = os.path.abspath(template_path)
+    return copy.deepcopy(_parsed_template(path, os.stat(path).st_mtime_ns))
+
+
+@lru_cache(maxsize=4096, typed=True)
+def _cached_str(value):
+    return str(value)
 
 
-def set_param(params_elem, param_id, value):
-    """Set a PARAM value, creating it if it doesn't exist."""
-    for p in params_elem.findall('PARAM'):
-        if p.get('id') == param_id:
-            p.set('value', str(value))
-            return
+def value_str(value):
+    """
+    str() of a PARAM/node value (the shortest exact repr for floats), cached
+    because the same constants are written over and over. typed=True keeps
+    1, 1.0 and True apart; zeros bypass the cache, since 0.0 and -0.0 are
+    equal keys there but print differently.
+    """
+    return str(value) if value == 0 else _cached_str(value)
+
+
+def index_params(params_elem):
+    """Map PARAM id -> element (the first one, if an id repeats)."""
+    return {p.get('id'): p for p in reversed(params_elem.findall('PARAM'))}
+
+
+def set_param(params_elem, index, param_id, value):
+    """Set a PARAM value, creating it if it doesn't exist. index is from index_params."""
+    p = index.get(param_id)
+    if p is not None:
+        text = value_str(value)
+        # Most config values repeat the template's; leave those untouched
+        if p.get('value') != text:
+            p.set('value', text)
+        return
     # Create new param if not found
     new_p = ET.SubElement(params_elem, 'PARAM')
     new_p.set('id', param_id)
-    new_p.set('value', str(value))
+    new_p.set('value', value_str(value))
+    index[param_id] = new_p
 
 
 def replace_envelope(data_elem, env_name, nodes):
@@ -39,34 +95,66 @@ def replace_envelope(data_elem, env_name, nodes):
     if env is None:
         env = ET.SubElement(data_elem, env_name)
     else:
-        # Clear existing nodes
-        for node in list(env):
-            env.remove(node)
+        # Drop the existing nodes in one go; clear() also drops the element's
+        # own attributes, so put those back (whitespace is redone on write)
+        attrib = dict(env.attrib)
+        env.clear()
+        env.attrib.update(attrib)
     
-    # Add new nodes
-    for n in nodes:
-        node_elem = ET.SubElement(env, 'node')
-        node_elem.set('x', str(n['x']))
-        node_elem.set('y', str(n['y']))
-        node_elem.set('c', str(n.get('c', 0.0)))
-        node_elem.set('isKeytracked', '0')
-        node_elem.set('isPhaseLocked', '0')
-        node_elem.set('lockedPhaseValue', '0.0')
+    # Build the new nodes with their whole attrib dict, then attach them with
+    # a single extend()
+    env.extend([
+        ET.Element('node', {
+            'x': value_str(n['x']),
+            'y': value_str(n['y']),
+            'c': value_str(n.get('c', 0.0)),
+            'isKeytracked': '0',
+            'isPhaseLocked': '0',
+            'lockedPhaseValue': '0.0',
+        })
+        for n in nodes
+    ])
 
 
 def clear_sample_data(data_elem):
     """Clear sample/sub file references so the preset doesn't look for missing files."""
+    # One pass, classifying each attribute once
     for key in list(data_elem.attrib.keys()):
-        if 'File' in key and 'Dirty' not in key:
-            data_elem.set(key, '////////')
-        if 'FileDirty' in key:
-            data_elem.set(key, '0')
-    # Mark sub files as dirty so Kick 3 regenerates them
-    for key in list(data_elem.attrib.keys()):
-        if 'SubFullFileDirty' in key or 'SubFileDirty' in key:
-            data_elem.set(key, '1')
-        if 'AmpCurveFileDirty' in key or 'PitchCurveFileDirty' in key:
+        if ('SubFullFileDirty' in key or 'SubFileDirty' in key
+                or 'AmpCurveFileDirty' in key or 'PitchCurveFileDirty' in key):
+            # Mark sub files as dirty so Kick 3 regenerates them
             data_elem.set(key, '1')
+        elif 'FileDirty' in key:
+            data_elem.set(key, '0')
+        elif 'File' in key and 'Dirty' not in key:
+            data_elem.set(key, '////////')
+
+
+@lru_cache(maxsize=None)
+def slot_param_ids(slot_num):
+    """PARAM ids (and 0-based DATA envelope tags) for oscillator slot slot_num."""
+    return {
+        'type': f'Slot{slot_num}Type',
+        'gain': f'Slot{slot_num}Gain',
+        'mute': f'Slot{slot_num}Mute',
+        'pitch_max': f'Slot{slot_num}PitchEnvMax',
+        'pitch_semi': f'Slot{slot_num}PitchSemi',
+        'pitch_range_max': f'Slot{slot_num}PitchEnvRangeMax',
+        'amp_max_len': f'Slot{slot_num}AmpEnvMaxLen',
+        'pitch_nodes': tuple((f'Slot{slot_num}PitchNode{i}_x', f'Slot{slot_num}PitchNode{i}_y')
+                             for i in range(1, 9)),
+        'amp_nodes': tuple((f'Slot{slot_num}AmpNode{i}_x', f'Slot{slot_num}AmpNode{i}_y')
+                           for i in range(1, 9)),
+        'pitch_env': f'Slot{slot_num - 1}_PitchEnvelope',  # Envelopes use 0-based index
+        'amp_env': f'Slot{slot_num - 1}_AmpEnvelope',
+    }
+
+
+# (fx_routing insert key, osc key, PARAM id) in the order they are applied
+FX_ROUTED_IDS = [
+    (f'insert{insert_num}', f'osc{osc}', f'FXInsert{insert_num}Osc{osc}Routed')
+    for insert_num in [1, 2] for osc in range(1, 6)
+]
 
 
 def apply_config(tree, config):
@@ -78,156 +166,305 @@ def apply_config(tree, config):
     if params is None or data is None:
         raise ValueError("Template doesn't have expected Kick 3 structure (PARAMS + DATA)")
     
+    # Look each PARAM up by id instead of rescanning PARAMS per write
+    index = index_params(params)
+    
     # Clear sample references
     clear_sample_data(data)
     
     # === MASTER ===
     master = config.get('master', {})
     if 'length_ms' in master:
-        set_param(params, 'masterLength', master['length_ms'])
+        set_param(params, index, 'masterLength', master['length_ms'])
     if 'output_gain_db' in master:
-        set_param(params, 'outGain', master['output_gain_db'])
+        set_param(params, index, 'outGain', master['output_gain_db'])
     if 'pan' in master:
-        set_param(params, 'masterPan', master['pan'])
+        set_param(params, index, 'masterPan', master['pan'])
     if 'tuning_semitones' in master:
-        set_param(params, 'tuning', master['tuning_semitones'])
+        set_param(params, index, 'tuning', master['tuning_semitones'])
     if 'single_length_mode' in master:
-        set_param(params, 'singleLengthMode', 1.0 if master['single_length_mode'] else 0.0)
+        set_param(params, index, 'singleLengthMode', 1.0 if master['single_length_mode'] else 0.0)
     if 'processing_mode' in master:
-        set_param(params, 'processingMode', master['processing_mode'])
+        set_param(params, index, 'processingMode', master['processing_mode'])
     if 'gate' in master:
-        set_param(params, 'gate', master['gate'])
+        set_param(params, index, 'gate', master['gate'])
     
     # === LIMITER ===
     limiter = config.get('limiter', {})
     if 'enabled' in limiter:
-        set_param(params, 'Lim_Enable', 1.0 if limiter['enabled'] else 0.0)
+        set_param(params, index, 'Lim_Enable', 1.0 if limiter['enabled'] else 0.0)
     if 'threshold_db' in limiter:
-        set_param(params, 'Lim_Threshold', limiter['threshold_db'])
+        set_param(params, index, 'Lim_Threshold', limiter['threshold_db'])
     if 'lookahead' in limiter:
-        set_param(params, 'Lim_Lookahead', limiter['lookahead'])
+        set_param(params, index, 'Lim_Lookahead', limiter['lookahead'])
     if 'release' in limiter:
-        set_param(params, 'Lim_Release', limiter['release'])
+        set_param(params, index, 'Lim_Release', limiter['release'])
     
     # === SLOTS ===
     type_map = {'off': 0.0, 'sine': 1.0, 'sample': 2.0}
     
     for slot_config in config.get('slots', []):
         slot_num = slot_config.get('slot_number', 1)
-        env_idx = slot_num - 1  # Envelopes use 0-based index
+        ids = slot_param_ids(slot_num)
         
         # Type, gain, mute
         if 'type' in slot_config:
-            set_param(params, f'Slot{slot_num}Type', type_map.get(slot_config['type'], 0.0))
+            set_param(params, index, ids['type'], type_map.get(slot_config['type'], 0.0))
         if 'gain_db' in slot_config:
-            set_param(params, f'Slot{slot_num}Gain', slot_config['gain_db'])
+            set_param(params, index, ids['gain'], slot_config['gain_db'])
         if 'muted' in slot_config:
-            set_param(params, f'Slot{slot_num}Mute', 1.0 if slot_config['muted'] else 0.0)
+            set_param(params, index, ids['mute'], 1.0 if slot_config['muted'] else 0.0)
         
         # Pitch envelope
         pe = slot_config.get('pitch_envelope', {})
         if 'max_freq_hz' in pe:
-            set_param(params, f'Slot{slot_num}PitchEnvMax', pe['max_freq_hz'])
+            set_param(params, index, ids['pitch_max'], pe['max_freq_hz'])
         if 'semitone_offset' in pe:
-            set_param(params, f'Slot{slot_num}PitchSemi', pe['semitone_offset'])
+            set_param(params, index, ids['pitch_semi'], pe['semitone_offset'])
         if 'range_max' in pe:
-            set_param(params, f'Slot{slot_num}PitchEnvRangeMax', pe['range_max'])
+            set_param(params, index, ids['pitch_range_max'], pe['range_max'])
         
         pitch_nodes = pe.get('nodes', [])
         if pitch_nodes:
             # Update coarse nodes (8 max)
-            for i in range(8):
+            for i, (x_id, y_id) in enumerate(ids['pitch_nodes']):
                 if i < len(pitch_nodes):
-                    set_param(params, f'Slot{slot_num}PitchNode{i+1}_x', pitch_nodes[i]['x'])
-                    set_param(params, f'Slot{slot_num}PitchNode{i+1}_y', pitch_nodes[i]['y'])
+                    set_param(params, index, x_id, pitch_nodes[i]['x'])
+                    set_param(params, index, y_id, pitch_nodes[i]['y'])
                 else:
-                    set_param(params, f'Slot{slot_num}PitchNode{i+1}_x', 1.0)
-                    set_param(params, f'Slot{slot_num}PitchNode{i+1}_y', pitch_nodes[-1]['y'] if pitch_nodes else 0.09)
+                    set_param(params, index, x_id, 1.0)
+                    set_param(params, index, y_id, pitch_nodes[-1]['y'] if pitch_nodes else 0.09)
             
             # Update detailed envelope in DATA
-            replace_envelope(data, f'Slot{env_idx}_PitchEnvelope', pitch_nodes)
+            replace_envelope(data, ids['pitch_env'], pitch_nodes)
         
         # Amp envelope
         ae = slot_config.get('amp_envelope', {})
         if 'max_length_ms' in ae:
-            set_param(params, f'Slot{slot_num}AmpEnvMaxLen', ae['max_length_ms'])
+            set_param(params, index, ids['amp_max_len'], ae['max_length_ms'])
         
         amp_nodes = ae.get('nodes', [])
         if amp_nodes:
             # Update coarse nodes
-            for i in range(8):
+            for i, (x_id, y_id) in enumerate(ids['amp_nodes']):
                 if i < len(amp_nodes):
-                    set_param(params, f'Slot{slot_num}AmpNode{i+1}_x', amp_nodes[i]['x'])
-                    set_param(params, f'Slot{slot_num}AmpNode{i+1}_y', amp_nodes[i]['y'])
+                    set_param(params, index, x_id, amp_nodes[i]['x'])
+                    set_param(params, index, y_id, amp_nodes[i]['y'])
                 else:
-                    set_param(params, f'Slot{slot_num}AmpNode{i+1}_x', 1.0)
-                    set_param(params, f'Slot{slot_num}AmpNode{i+1}_y', 0.0)
+                    set_param(params, index, x_id, 1.0)
+                    set_param(params, index, y_id, 0.0)
             
             # Update detailed envelope in DATA
-            replace_envelope(data, f'Slot{env_idx}_AmpEnvelope', amp_nodes)
+            replace_envelope(data, ids['amp_env'], amp_nodes)
     
     # === FX ROUTING ===
     fx = config.get('fx_routing', {})
-    for insert_num in [1, 2]:
-        insert_key = f'insert{insert_num}'
-        if insert_key in fx:
-            for osc in range(1, 6):
-                if f'osc{osc}' in fx[insert_key]:
-                    set_param(params, f'FXInsert{insert_num}Osc{osc}Routed',
-                              1.0 if fx[insert_key][f'osc{osc}'] else 0.0)
+    for insert_key, osc_key, param_id in FX_ROUTED_IDS:
+        if insert_key in fx and osc_key in fx[insert_key]:
+            set_param(params, index, param_id, 1.0 if fx[insert_key][osc_key] else 0.0)
     
     return tree
 
 
-def write_preset(tree, output_path):
-    """Write the modified tree as a Kick 3 .preset file."""
+def indent_tree(elem, level=0, space='  '):
+    """Indent an element tree in place (ET.indent, with a fallback for Python < 3.9)."""
+    if hasattr(ET, 'indent'):
+        ET.indent(elem, space=space, level=level)
+        return
+    pad = '\n' + level * space
+    if len(elem):
+        if not elem.text or not elem.text.strip():
+            elem.text = pad + space
+        for child in elem:
+            indent_tree(child, level + 1, space)
+        if not child.tail or not child.tail.strip():
+            child.tail = pad
+    if level and (not elem.tail or not elem.tail.strip()):
+        elem.tail = pad
+
+
+# Stand-in text for the PARAMS contents while the rest of the tree is serialized
+PARAMS_MARKER = 'KICK3-PARAMS-BLOCK'
+PARAM_CLOSE = '/>' if HAS_LXML else ' />'  # how ET.tostring closes an empty element
+_NEEDS_ESCAPE = re.compile(r'[&<>"\n\r\t]')
+
+
+@lru_cache(maxsize=4)
+def params_format(param_ids):
+    """
+    str.format template for an indented PARAMS body with these ids, in
+    order (its text, each PARAM and their tails), taking one value per PARAM.
+    Built once per template layout instead of serializing 1006 elements.
+    """
+    lines = [
+        '<PARAM id="%s" value="{}"%s' % (pid.replace('{', '{{').replace('}', '}}'), PARAM_CLOSE)
+        for pid in param_ids
+    ]
+    return '\n    ' + '\n    '.join(lines) + '\n  '
+
+
+def params_block(params_elem):
+    """
+    The serialized body of an indented PARAMS element, or None unless every
+    child is a plain <PARAM id value/> needing no escaping.
+    """
+    ids = []
+    values = []
+    for p in params_elem:
+        if p.tag != 'PARAM' or len(p) or p.text or tuple(p.keys()) != ('id', 'value'):
+            return None
+        ids.append(p.get('id'))
+        values.append(p.get('value'))
+    if _NEEDS_ESCAPE.search(''.join(ids)) or _NEEDS_ESCAPE.search(''.join(values)):
+        return None
+    return params_format(tuple(ids)).format(*values)
+
+
+def serialize_pretty(root):
+    """
+    ET.tostring of an indented Kick 3 tree, with the PARAMS body written from
+    params_format and only the remaining elements going through ET.
+    """
+    params = root.find('PARAMS')
+    block = params_block(params) if params is not None and len(params) else None
+    if block is None:
+        return ET.tostring(root, encoding='utf-8')
+    
+    # Swap the PARAMs out for a marker while the rest is serialized
+    children = list(params)
+    text = params.text
+    del params[:]
+    params.text = PARAMS_MARKER
+    try:
+        body = ET.tostring(root, encoding='utf-8')
+    finally:
+        params.text = text
+        params.extend(children)
+    return body.replace(PARAMS_MARKER.encode('ascii'), block.encode('utf-8'), 1)
+
+
+def write_preset(tree, output_path, pretty=True):
+    """
+    Write the modified tree as a Kick 3 .preset file. With pretty=False the
+    indent pass is skipped and the template's own whitespace is written as
+    it is; Kick 3 ignores the layout either way.
+    """
     root = tree.getroot()
     
-    # Use ElementTree's built-in write with xml_declaration
-    # But we need to ensure CRLF line endings
-    rough = ET.tostring(root, encoding='unicode', xml_declaration=False)
+    # Indent in place (replacing the template's own whitespace) and
+    # serialize once; no second DOM is built
+    if pretty:
+        indent_tree(root)
+        # lxml serializes in C already, and collecting the PARAM values through
+        # its element proxies costs more than the template saves
+        body = ET.tostring(root, encoding='utf-8') if HAS_LXML else serialize_pretty(root)
+    else:
+        body = ET.tostring(root, encoding='utf-8')  # lowercase: no declaration
+    output = b'<?xml version="1.0" encoding="UTF-8"?>\n' + body + b'\n'
     
-    # Reformat with minidom for readability
-    try:
-        parsed = minidom.parseString(f'<?xml version="1.0" encoding="UTF-8"?>\n{rough}')
-        pretty = parsed.toprettyxml(indent='  ')
-        # Remove the extra declaration minidom adds
-        lines = pretty.split('\n')
-        if lines[0].startswith('<?xml'):
-            lines[0] = '<?xml version="1.0" encoding="UTF-8"?>'
-        output = '\n'.join(lines)
-    except Exception:
-        output = f'<?xml version="1.0" encoding="UTF-8"?>\n{rough}'
+    # Kick 3 expects CRLF line endings; convert the bytes and write once
+    with open(output_path, 'wb') as f:
+        f.write(output.replace(b'\n', b'\r\n'))
+
+
+def load_config(config_path):
+    """Read a JSON kick config."""
+    with open(config_path, 'rb') as f:
+        return json_loads(f.read())
+
+
+def generate_one(template_path, config_path, output_path, pretty=True):
+    """Apply one JSON config to the template and write it to output_path."""
+    tree = load_template(template_path)
+    config = load_config(config_path)
+    print(f"Config: {config_path}")
+    
+    # Apply
+    tree = apply_config(tree, config)
+    
+    # Write
+    write_preset(tree, output_path, pretty=pretty)
+    print(f"Generated: {output_path}")
+    return tree
+
+
+def generate_to_file(template_path, config_path, output_path, pretty=True):
+    """Generate one preset quietly (a batch job; runs in a worker process)."""
+    tree = apply_config(load_template(template_path), load_config(config_path))
+    write_preset(tree, output_path, pretty=pretty)
+    return output_path
+
+
+def config_paths(paths):
+    """Expand any directories in paths to the .json configs inside them."""
+    expanded = []
+    for path in paths:
+        if os.path.isdir(path):
+            expanded.extend(sorted(e.path for e in os.scandir(path)
+                                   if e.is_file() and e.name.endswith('.json')))
+        else:
+            expanded.append(path)
+    return expanded
+
+
+def generate_batch(template_path, configs, outdir, pretty=True, jobs=None):
+    """Generate <name>.preset in outdir for every config, across processes."""
+    from concurrent.futures import ProcessPoolExecutor
     
-    with open(output_path, 'w', encoding='utf-8', newline='\r\n') as f:
-        f.write(output)
+    outputs = [os.path.join(outdir, os.path.splitext(os.path.basename(c))[0] + '.preset')
+               for c in configs]
+    
+    # Configs with the same file name would race on the same output
+    first_config = {}
+    for config_path, output_path in zip(configs, outputs):
+        if output_path in first_config:
+            sys.exit(f"{config_path} and {first_config[output_path]} would both "
+                     f"write {output_path}")
+        first_config[output_path] = config_path
+    
+    os.makedirs(outdir, exist_ok=True)
+    
+    # Each preset is independent and CPU-bound; every worker parses the
+    # template once (load_template's cache) and copies it per config
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(generate_to_file, template_path, config_path, output_path, pretty)
+                   for config_path, output_path in zip(configs, outputs)]
+        for config_path, future in zip(configs, futures):
+            print(f"Generated: {future.result()} (from {config_path})")
+    return len(configs)
 
 
 def main():
     parser = argparse.ArgumentParser(description='Generate Kick 3 compatible preset files')
-    parser.add_argument('config', help='JSON config with kick parameters')
+    parser.add_argument('config', nargs='+',
+                        help='JSON config(s) with kick parameters, or directories of them')
     parser.add_argument('--template', '-t', required=True, help='Template .preset file (Kick 3 format)')
-    parser.add_argument('--output', '-o', default='new_kick.preset', help='Output .preset path')
+    parser.add_argument('--output', '-o',
+                        help='Output .preset path (default: new_kick.preset); with several '
+                             'configs, the output directory (default: .)')
+    parser.add_argument('--no-pretty', action='store_true',
+                        help="Skip re-indenting the XML (faster; Kick 3 doesn't need it)")
+    parser.add_argument('--verify', action='store_true',
+                        help='Re-parse the written preset for the summary instead of using the in-memory tree')
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count(),
+                        help='Worker processes when generating several presets')
     args = parser.parse_args()
     
-    # Load template
+    # Load template (parsed once and copied per config)
     print(f"Template: {args.template}")
-    tree = load_template(args.template)
     
-    # Load config
-    with open(args.config) as f:
-        config = json.load(f)
-    print(f"Config: {args.config}")
+    configs = config_paths(args.config)
+    if len(configs) > 1 or any(os.path.isdir(p) for p in args.config):
+        count = generate_batch(args.template, configs, args.output or '.',
+                               pretty=not args.no_pretty, jobs=args.jobs)
+        print(f"\nGenerated {count} presets")
+        return
     
-    # Apply
-    tree = apply_config(tree, config)
-    
-    # Write
-    write_preset(tree, args.output)
-    print(f"Generated: {args.output}")
+    args.output = args.output or 'new_kick.preset'
+    tree = generate_one(args.template, configs[0], args.output, pretty=not args.no_pretty)
     
-    # Verify
-    verify_tree = ET.parse(args.output)
+    # Summarise the tree just written; --verify reads it back from disk instead
+    verify_tree = ET.parse(args.output) if args.verify else tree
     verify_root = verify_tree.getroot()
     print(f"  Root tag: <{verify_root.tag}> ✓")
     verify_params = verify_root.find('PARAMS')
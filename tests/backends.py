@@ -0,0 +1,27 @@
+"""Load fresh copies of the toolkit scripts, optionally without lxml."""
+
+import importlib.util
+import os
+import sys
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts')
+sys.path.insert(0, SCRIPTS)
+
+
+def load_script(name, block_lxml):
+    """A fresh copy of scripts/<name>.py, with lxml made unimportable if block_lxml."""
+    saved = sys.modules.get('lxml', False)
+    if block_lxml:
+        sys.modules['lxml'] = None
+    try:
+        alias = f"{name}_{'stdlib' if block_lxml else 'default'}"
+        spec = importlib.util.spec_from_file_location(alias, os.path.join(SCRIPTS, f'{name}.py'))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        if block_lxml:
+            if saved is False:
+                del sys.modules['lxml']
+            else:
+                sys.modules['lxml'] = saved
+    return module
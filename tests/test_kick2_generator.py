@@ -0,0 +1,50 @@
+"""generate_preset_fast against the ElementTree writer it replaced, on both XML backends."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from backends import load_script
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIMPLE_CONFIG = os.path.join(ROOT, 'examples', 'simple_psy_kick.json')
+KHAZ_PRESET = os.path.join(ROOT, 'presets', 'references', 'KHAZ_Hypnotic_Kick.preset')
+
+
+class FastPathTests(unittest.TestCase):
+    
+    def setUp(self):
+        self.generators = [load_script('kick2_generator', block_lxml=False),
+                           load_script('kick2_generator', block_lxml=True)]
+        parser = load_script('kick2_parser', block_lxml=True)
+        with open(SIMPLE_CONFIG) as f:
+            simple = self.generators[1].create_from_simple(json.load(f))
+        self.configs = {'simple': simple, 'khaz': parser.parse_preset(KHAZ_PRESET)}
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, 'ref.preset')
+    
+    def reference(self, gen, config, plugin_version, pretty):
+        gen.write_preset(gen.generate_preset(config, plugin_version), self.path, pretty=pretty)
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        # The fast path writes empty elements as lxml does (<PARAM .../>, not
+        # the stdlib's <PARAM ... />) and tabs as the stdlib does (&#09;, not &#9;)
+        if gen.HAS_LXML:
+            return data.replace(b'&#9;', b'&#09;')
+        return data.replace(b' />', b'/>')
+    
+    def test_matches_tree_writer(self):
+        for gen in self.generators:
+            for name, config in self.configs.items():
+                for version in ('1.5.3', 'a&b <"1.5">\r\n\t'):
+                    for pretty in (True, False):
+                        with self.subTest(lxml=gen.HAS_LXML, config=name,
+                                          version=version, pretty=pretty):
+                            self.assertEqual(gen.generate_preset_fast(config, version, pretty),
+                                             self.reference(gen, config, version, pretty))
+
+
+if __name__ == '__main__':
+    unittest.main()
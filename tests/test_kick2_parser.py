@@ -0,0 +1,36 @@
+"""Parser regressions, run against both XML backends (lxml when installed, and stdlib)."""
+
+import os
+import unittest
+
+from backends import load_script
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUY_PRESET = os.path.join(ROOT, 'presets', 'generated', 'guy_preset_1.preset')
+
+
+def params_as_fallback(data):
+    """guy_preset_1 with its <Params> renamed to <PARAMS> behind a comment-only <Params>."""
+    data = data.replace(b'</Params>', b'</PARAMS>', 1)
+    return data.replace(b'<Params>', b'<Params><!-- c --></Params><PARAMS>', 1)
+
+
+class ParserBackendTests(unittest.TestCase):
+    
+    def setUp(self):
+        with open(GUY_PRESET, 'rb') as f:
+            self.preset = f.read()
+        self.parsers = [load_script('kick2_parser', block_lxml=False),
+                        load_script('kick2_parser', block_lxml=True)]
+        self.assertFalse(self.parsers[1].HAS_LXML)
+    
+    def test_comment_only_params_falls_through(self):
+        expected = self.parsers[1].parse_preset_bytes(self.preset, 'guy')
+        for parser in self.parsers:
+            with self.subTest(lxml=parser.HAS_LXML):
+                data = parser.parse_preset_bytes(params_as_fallback(self.preset), 'guy')
+                self.assertEqual(data, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+"""The Numba kernels against the NumPy path they stand in for."""
+
+import json
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+import kick2_parser
+import kick2_renderer
+
+KHAZ_PRESET = os.path.join(ROOT, 'presets', 'references', 'KHAZ_Hypnotic_Kick.preset')
+
+
+@unittest.skipUnless(kick2_renderer.HAS_NUMBA and kick2_renderer.jit_kernels() is not None,
+                     'needs numpy and numba')
+class JitKernelTests(unittest.TestCase):
+    
+    def setUp(self):
+        # A parsed preset with sine and noise slots and the limiter on
+        self.config = json.loads(json.dumps(kick2_parser.parse_preset(KHAZ_PRESET)))
+        self.assertTrue(self.config['limiter']['enabled'])
+    
+    def test_jit_matches_numpy(self):
+        import numpy as np
+        expected = kick2_renderer.synthesize_kick(self.config)
+        rendered = kick2_renderer.synthesize_kick(self.config, jit=True)
+        self.assertEqual(len(rendered), len(expected))
+        self.assertLess(np.abs(rendered - expected).max(), 1e-9)
+    
+    def test_batch_gate(self):
+        kicks = kick2_renderer.JIT_MIN_BATCH_KICKS
+        self.assertFalse(kick2_renderer.batch_jit(kicks * 4 - 1, jobs=4))
+        self.assertTrue(kick2_renderer.batch_jit(kicks * 4, jobs=4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Answer validation in the questionnaire prompts."""
+
+import contextlib
+import io
+import os
+import sys
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import kick_questionnaire
+
+
+def answer(func, *args, replies):
+    """Call a prompt with scripted replies; return its result."""
+    with mock.patch('builtins.input', side_effect=replies), \
+            contextlib.redirect_stdout(io.StringIO()):
+        return func(*args)
+
+
+def convert(raw):
+    """How ask_number converted an answer before the regexes (None if rejected)."""
+    try:
+        return float(raw) if '.' in raw else int(raw)
+    except ValueError:
+        return None
+
+
+class AskNumberTests(unittest.TestCase):
+    
+    def test_accepts_what_int_and_float_accepted(self):
+        for raw in ['5', '-5', '+5', '1_000', '0.5', '5.', '.5', '-.5',
+                    '1.5e3', '2.E-1', '1.5E+2', '1_0.2_5']:
+            with self.subTest(raw=raw):
+                self.assertEqual(answer(kick_questionnaire.ask_number, 'Value', -1e6, 1e6,
+                                        replies=[raw]), convert(raw))
+    
+    def test_rejects_what_int_and_float_rejected(self):
+        for raw in ['abc', '1e3', '2E-1', '.', '1..5', '1.5e', '_1', '1_', 'nan', 'inf']:
+            with self.subTest(raw=raw):
+                self.assertIsNone(convert(raw))
+                # A rejected answer re-prompts; the next reply is taken instead
+                self.assertEqual(answer(kick_questionnaire.ask_number, 'Value', 0, 10,
+                                        replies=[raw, '7']), 7)
+
+
+if __name__ == '__main__':
+    unittest.main()